@@ -1,9 +1,36 @@
-from django.contrib import admin
-from .models import UserProfile
+from django.contrib import admin, messages
+from .authentication import revoke_tokens
+from .models import UserProfile, EmailOutbox, ApiToken
 
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ('user', 'role')
+    list_display = ('user', 'role', 'digest_frequency')
     search_fields = ('user__username', 'user__email', 'role')
-    list_filter = ('role',)
+    list_filter = ('role', 'digest_frequency')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'subject', 'statut', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('statut',)
+    search_fields = ('to_email', 'subject')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ('prefix', 'user', 'name', 'created_at', 'last_used_at', 'expires_at', 'revoked_at')
+    list_filter = ('revoked_at',)
+    search_fields = ('prefix', 'user__username', 'name')
+    readonly_fields = ('prefix', 'key_hash', 'created_at', 'last_used_at')
+    actions = ['revoquer']
+
+    def has_add_permission(self, request):
+        # Les jetons sont créés avec `manage.py issue_token` (la clé n'est affichée qu'une fois)
+        return False
+
+    @admin.action(description="Révoquer les jetons sélectionnés")
+    def revoquer(self, request, queryset):
+        count = revoke_tokens(queryset)
+        self.message_user(request, f"{count} jetons révoqués.", messages.SUCCESS)
@@ -0,0 +1,107 @@
+"""Authentification DRF par jeton haché (SHA-256), avec cache mémoire du principal."""
+import hashlib
+import secrets
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .models import ApiToken
+from .permissions import get_user_roles
+
+DEFAULT_CACHE_TIMEOUT = 60
+PREFIX_LENGTH = 8
+
+
+def hash_key(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def token_cache_key(key_hash: str) -> str:
+    return f"accounts:api-token:{key_hash}"
+
+
+def _cache_timeout() -> int:
+    return getattr(settings, 'API_TOKEN_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+
+
+def issue_token(user: User, name: str = '', expires_at=None) -> Tuple[ApiToken, str]:
+    """Crée un jeton et retourne (jeton, clé en clair). La clé n'est plus récupérable ensuite."""
+    key = secrets.token_urlsafe(32)
+    token = ApiToken.objects.create(
+        user=user, name=name, prefix=key[:PREFIX_LENGTH], key_hash=hash_key(key), expires_at=expires_at,
+    )
+    return token, key
+
+
+def revoke_tokens(queryset) -> int:
+    """Révoque les jetons actifs du queryset et les retire du cache."""
+    hashes = list(queryset.filter(revoked_at__isnull=True).values_list('key_hash', flat=True))
+    count = queryset.filter(revoked_at__isnull=True).update(revoked_at=timezone.now())
+    cache.delete_many([token_cache_key(key_hash) for key_hash in hashes])
+    return count
+
+
+def invalidate_user_tokens(user_id: int) -> None:
+    """Retire du cache les principaux des jetons de l'utilisateur (rôles, groupes ou ``is_active`` modifiés)."""
+    hashes = ApiToken.objects.filter(user_id=user_id, revoked_at__isnull=True).values_list('key_hash', flat=True)
+    cache.delete_many([token_cache_key(key_hash) for key_hash in hashes])
+
+
+class HashedTokenAuthentication(BaseAuthentication):
+    """En-tête ``Authorization: Token <clé>``.
+
+    Un SHA-256 suffit (clé aléatoire de 256 bits) : pas de PBKDF2 à chaque requête.
+    Le principal (utilisateur + rôles) est mis en cache ``API_TOKEN_CACHE_TIMEOUT`` secondes.
+    """
+
+    keyword = 'Token'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("En-tête Token invalide.")
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("En-tête Token invalide.")
+        return self.authenticate_credentials(key)
+
+    def authenticate_credentials(self, key: str):
+        key_hash = hash_key(key)
+        principal = cache.get(token_cache_key(key_hash))
+        if principal is None:
+            principal = self._load_principal(key_hash)
+
+        user, token_id, expires_at = principal
+        if expires_at is not None and expires_at <= timezone.now():
+            cache.delete(token_cache_key(key_hash))
+            raise exceptions.AuthenticationFailed("Jeton expiré.")
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("Utilisateur inactif.")
+        return user, token_id
+
+    def _load_principal(self, key_hash: str):
+        try:
+            token = ApiToken.objects.select_related('user').get(key_hash=key_hash)
+        except ApiToken.DoesNotExist:
+            raise exceptions.AuthenticationFailed("Jeton invalide.")
+        if not token.is_active:
+            raise exceptions.AuthenticationFailed("Jeton révoqué ou expiré.")
+
+        user = token.user
+        get_user_roles(user)  # les rôles voyagent avec l'utilisateur mis en cache
+        principal = (user, token.pk, token.expires_at)
+        cache.set(token_cache_key(key_hash), principal, _cache_timeout())
+        # last_used_at est rafraîchi au plus une fois par durée de cache
+        ApiToken.objects.filter(pk=token.pk).update(last_used_at=timezone.now())
+        return principal
+
+    def authenticate_header(self, request) -> Optional[str]:
+        return self.keyword
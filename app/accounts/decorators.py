@@ -2,21 +2,16 @@ from django.contrib.auth.mixins import UserPassesTestMixin
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import user_passes_test
 
+from .permissions import get_user_roles, request_roles
+
 def is_admin(user):
-    return user.is_authenticated and (
-        user.is_superuser or
-        user.is_staff or
-        user.groups.filter(name='admin_group').exists()
-    )
+    return get_user_roles(user).is_admin
 
 def is_recruiter(user):
-    return user.is_authenticated and (
-        is_admin(user) or
-        user.groups.filter(name='recruteur_group').exists()
-    )
+    return get_user_roles(user).is_recruiter
 
 def is_candidate(user):
-    return user.is_authenticated and user.groups.filter(name='candidat_group').exists()
+    return get_user_roles(user).is_candidate
 
 admin_required = user_passes_test(is_admin, login_url='/login/')
 recruteur_required = user_passes_test(is_recruiter, login_url='/login/')
@@ -24,12 +19,12 @@ candidat_required = user_passes_test(is_candidate, login_url='/login/')
 
 class AdminRequiredMixin(UserPassesTestMixin):
     def test_func(self):
-        return is_admin(self.request.user)
+        return request_roles(self.request).is_admin
 
 class RecruiterRequiredMixin(UserPassesTestMixin):
     def test_func(self):
-        return is_recruiter(self.request.user)
+        return request_roles(self.request).is_recruiter
 
 class CandidateRequiredMixin(UserPassesTestMixin):
     def test_func(self):
-        return is_candidate(self.request.user)
\ No newline at end of file
+        return request_roles(self.request).is_candidate
\ No newline at end of file
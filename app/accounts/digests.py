@@ -0,0 +1,86 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import DigestEntry, UserProfile
+from .outbox import queue_templated_emails
+
+DIGEST_SUBJECT = "Résumé de vos notifications"
+DIGEST_WINDOWS = {
+    UserProfile.DigestFrequency.HOURLY: timedelta(hours=1),
+    UserProfile.DigestFrequency.DAILY: timedelta(days=1),
+}
+DELETE_CHUNK_SIZE = 500
+
+
+def add_to_digest(entries: Iterable[Tuple[int, str, str]]) -> List[DigestEntry]:
+    """Ajoute des couples (user_id, catégorie, message) aux résumés en attente (un seul INSERT)."""
+    rows = [DigestEntry(user_id=user_id, category=category, message=message) for user_id, category, message in entries]
+    if not rows:
+        return []
+    return DigestEntry.objects.bulk_create(rows)
+
+
+def _due_users(now) -> Dict[int, Dict]:
+    """Utilisateurs dont le plus ancien événement en attente a dépassé leur fenêtre de résumé."""
+    pending = (
+        DigestEntry.objects.values(
+            'user_id', 'user__email', 'user__first_name', 'user__username', 'user__profile__digest_frequency'
+        )
+        .annotate(oldest=Min('created_at'))
+        .order_by()
+    )
+    due = {}
+    for row in pending:
+        # Un utilisateur revenu en mode immédiat reçoit ses événements restants sans attendre
+        window = DIGEST_WINDOWS.get(row['user__profile__digest_frequency'], timedelta(0))
+        if row['oldest'] <= now - window:
+            due[row['user_id']] = row
+    return due
+
+
+def send_digests(now: Optional[datetime] = None) -> Tuple[int, int]:
+    """Regroupe les événements en attente en un email par utilisateur. Retourne (emails, événements)."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = _due_users(now)
+        if not due:
+            return 0, 0
+
+        entries = list(
+            DigestEntry.objects.filter(user_id__in=list(due), created_at__lte=now)
+            .order_by('user_id', 'created_at', 'id')
+            .values('id', 'user_id', 'category', 'message', 'created_at')
+        )
+        by_user = defaultdict(list)
+        for entry in entries:
+            by_user[entry['user_id']].append({
+                'category': entry['category'],
+                'message': entry['message'],
+                'date': timezone.localtime(entry['created_at']).strftime('%d/%m/%Y %H:%M'),
+            })
+
+        recipients = []
+        for user_id, items in by_user.items():
+            user = due[user_id]
+            recipients.append((user['user__email'], {
+                'first_name': user['user__first_name'] or user['user__username'],
+                'count': len(items),
+                'entries': items,
+            }))
+        queue_templated_emails(
+            subject=DIGEST_SUBJECT,
+            recipients=recipients,
+            template_txt='accounts/emails/digest.txt',
+            html_template='accounts/emails/digest.html',
+        )
+
+        ids = [entry['id'] for entry in entries]
+        for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+            DigestEntry.objects.filter(pk__in=ids[start:start + DELETE_CHUNK_SIZE]).delete()
+
+    return len(by_user), len(entries)
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.authentication import issue_token
+
+
+class Command(BaseCommand):
+    help = "Crée un jeton d'API pour un utilisateur (la clé n'est affichée qu'une fois)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--name', default='', help="Libellé du jeton (ex: nom de l'intégration)")
+        parser.add_argument('--expires-days', type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"Utilisateur '{options['username']}' introuvable.")
+
+        expires_at = None
+        if options['expires_days']:
+            expires_at = timezone.now() + timedelta(days=options['expires_days'])
+
+        token, key = issue_token(user, name=options['name'], expires_at=expires_at)
+        self.stdout.write(self.style.SUCCESS(f"Jeton {token.prefix}… créé pour {user.username}."))
+        self.stdout.write(key)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.authentication import revoke_tokens
+from accounts.models import ApiToken
+
+
+class Command(BaseCommand):
+    help = "Révoque un jeton d'API (par préfixe) ou tous les jetons d'un utilisateur"
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument('--prefix', help="Préfixe affiché à la création du jeton")
+        group.add_argument('--user', help="Révoque tous les jetons de cet utilisateur")
+
+    def handle(self, *args, **options):
+        if options['prefix']:
+            tokens = ApiToken.objects.filter(prefix=options['prefix'])
+        else:
+            tokens = ApiToken.objects.filter(user__username=options['user'])
+
+        if not tokens.exists():
+            raise CommandError("Aucun jeton correspondant.")
+
+        count = revoke_tokens(tokens)
+        self.stdout.write(self.style.SUCCESS(f"{count} jeton(s) révoqué(s)."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.digests import send_digests
+
+
+class Command(BaseCommand):
+    help = "Met en file un email de résumé par utilisateur dont la fenêtre de résumé est écoulée"
+
+    def handle(self, *args, **options):
+        emails, events = send_digests()
+        self.stdout.write(self.style.SUCCESS(f"{emails} résumés mis en file ({events} événements)."))
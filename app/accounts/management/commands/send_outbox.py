@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import DEFAULT_BATCH_SIZE, process_outbox
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails en attente dans l'outbox (par lots, avec tentatives et backoff)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help="Tourne en continu (mode worker)")
+        parser.add_argument('--interval', type=float, default=5.0, help="Pause en secondes quand l'outbox est vide")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total_sent = total_failed = 0
+
+        while True:
+            sent, failed = process_outbox(batch_size=batch_size, max_attempts=options['max_attempts'])
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f"{total_sent} emails envoyés, {total_failed} échecs."))
@@ -0,0 +1,42 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .permissions import get_user_roles
+
+
+class RequestRoles:
+    """Rôles de ``request.user`` relus à chaque accès : suit la connexion et l'authentification DRF.
+
+    ``get_user_roles`` mémorise le résultat sur l'instance utilisateur : une requête au plus.
+    """
+
+    __slots__ = ('_request',)
+
+    def __init__(self, request):
+        self._request = request
+
+    def __getattr__(self, name):
+        return getattr(get_user_roles(self._request.user), name)
+
+
+class UserRolesMiddleware:
+    """Expose ``request.roles`` : rôles de l'utilisateur, résolus à la première lecture."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request.roles = RequestRoles(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        # Résolution paresseuse : aucune requête ici, la première lecture se fait côté vue
+        request.roles = RequestRoles(request)
+        return await self.get_response(request)
@@ -1,4 +1,6 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 
@@ -8,8 +10,16 @@ class UserProfile(models.Model):
         RECRUITER = 'recruiter', 'Recruteur'
         CANDIDATE = 'candidate', 'Candidat'
 
+    class DigestFrequency(models.TextChoices):
+        IMMEDIATE = 'immediate', 'Immédiat'
+        HOURLY = 'hourly', 'Résumé horaire'
+        DAILY = 'daily', 'Résumé quotidien'
+
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     role = models.CharField(max_length=20, choices=Roles.choices, default=Roles.CANDIDATE)
+    digest_frequency = models.CharField(
+        max_length=20, choices=DigestFrequency.choices, default=DigestFrequency.IMMEDIATE
+    )
 
     class Meta:
         permissions = [
@@ -19,4 +29,76 @@ class UserProfile(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.user.username} ({self.get_role_display()})"
\ No newline at end of file
+        return f"{self.user.username} ({self.get_role_display()})"
+
+
+class EmailOutbox(models.Model):
+    class Statuts(models.TextChoices):
+        EN_ATTENTE = 'pending', 'En attente'
+        ENVOYE = 'sent', 'Envoyé'
+        ECHEC = 'failed', 'Échec'
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    template_txt = models.CharField(max_length=255)
+    html_template = models.CharField(max_length=255, blank=True)
+    context = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    from_email = models.CharField(max_length=255, blank=True)
+    statut = models.CharField(max_length=20, choices=Statuts.choices, default=Statuts.EN_ATTENTE)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['statut', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.get_statut_display()})"
+
+
+class DigestEntry(models.Model):
+    """Événement en attente d'envoi dans le prochain résumé d'un utilisateur."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='digest_entries')
+    category = models.CharField(max_length=255)
+    message = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.category}"
+
+
+class ApiToken(models.Model):
+    """Jeton d'API : seul le SHA-256 de la clé est stocké."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='api_tokens')
+    name = models.CharField(max_length=100, blank=True)
+    prefix = models.CharField(max_length=12, db_index=True)
+    key_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.prefix}… ({self.user.username})"
+
+    @property
+    def is_active(self) -> bool:
+        if self.revoked_at is not None:
+            return False
+        return self.expires_at is None or self.expires_at > timezone.now()
@@ -0,0 +1,127 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+from .utils import send_mass_templated_email
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 60
+# Durée pendant laquelle une ligne réservée par un worker est invisible pour les autres
+CLAIM_LEASE_SECONDS = 300
+
+
+def queue_templated_emails(
+        subject: str,
+        recipients: Iterable[Tuple[str, Optional[Mapping]]],
+        template_txt: str,
+        html_template: Optional[str] = None,
+        from_email: Optional[str] = None,
+) -> List[EmailOutbox]:
+    """Ajoute un email par destinataire dans l'outbox (une seule requête INSERT)."""
+    rows = [
+        EmailOutbox(
+            to_email=email,
+            subject=subject,
+            template_txt=template_txt,
+            html_template=html_template or '',
+            context=dict(context or {}),
+            from_email=from_email or '',
+        )
+        for email, context in recipients
+        if email
+    ]
+    if not rows:
+        return []
+    return EmailOutbox.objects.bulk_create(rows)
+
+
+def queue_templated_email(
+        subject: str,
+        to_email: str,
+        template_txt: str,
+        context: Optional[Mapping] = None,
+        html_template: Optional[str] = None,
+        from_email: Optional[str] = None,
+) -> Optional[EmailOutbox]:
+    rows = queue_templated_emails(subject, [(to_email, context)], template_txt, html_template, from_email)
+    return rows[0] if rows else None
+
+
+def _backoff_delay(attempts: int) -> timedelta:
+    base = getattr(settings, 'EMAIL_OUTBOX_BACKOFF_SECONDS', DEFAULT_BACKOFF_SECONDS)
+    return timedelta(seconds=base * (2 ** max(attempts - 1, 0)))
+
+
+def claim_batch(batch_size: int = DEFAULT_BATCH_SIZE) -> List[EmailOutbox]:
+    """Réserve un lot d'emails à envoyer en repoussant leur prochaine tentative."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(statut=EmailOutbox.Statuts.EN_ATTENTE, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if rows:
+            EmailOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+            )
+    return rows
+
+
+def process_outbox(batch_size: int = DEFAULT_BATCH_SIZE, max_attempts: Optional[int] = None) -> Tuple[int, int]:
+    """Envoie un lot d'emails en attente. Retourne (envoyés, échecs)."""
+    if max_attempts is None:
+        max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+
+    rows = claim_batch(batch_size)
+    if not rows:
+        return 0, 0
+
+    # Un lot = une connexion SMTP ; les messages sont regroupés par gabarit
+    groups: Dict[Tuple[str, str, str, str], List[EmailOutbox]] = defaultdict(list)
+    for row in rows:
+        groups[(row.subject, row.template_txt, row.html_template, row.from_email)].append(row)
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        for (subject, template_txt, html_template, from_email), group in groups.items():
+            results = send_mass_templated_email(
+                subject=subject,
+                messages=[(row.to_email, row.context) for row in group],
+                template_txt=template_txt,
+                html_template=html_template or None,
+                from_email=from_email or None,
+                chunk_size=batch_size,
+                connection=connection,
+            )
+            for row, result in zip(group, results):
+                row.attempts += 1
+                if result.sent:
+                    row.statut = EmailOutbox.Statuts.ENVOYE
+                    row.sent_at = timezone.now()
+                    row.last_error = ''
+                    sent += 1
+                else:
+                    row.last_error = result.error or "Echec d'envoi"
+                    if row.attempts >= max_attempts:
+                        row.statut = EmailOutbox.Statuts.ECHEC
+                        logger.error("Email %s abandonné après %s tentatives", row.pk, row.attempts)
+                    else:
+                        row.next_attempt_at = timezone.now() + _backoff_delay(row.attempts)
+                    failed += 1
+    finally:
+        connection.close()
+
+    EmailOutbox.objects.bulk_update(rows, ['statut', 'attempts', 'last_error', 'next_attempt_at', 'sent_at'])
+    return sent, failed
@@ -0,0 +1,101 @@
+"""Résolution des rôles d'un utilisateur (profil + groupes), chargés une seule fois par requête."""
+from typing import FrozenSet, NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from .models import UserProfile
+
+ADMIN_GROUP = 'admin_group'
+RECRUITER_GROUP = 'recruteur_group'
+CANDIDATE_GROUP = 'candidat_group'
+
+ROLE_GROUPS = {
+    UserProfile.Roles.ADMIN: ADMIN_GROUP,
+    UserProfile.Roles.RECRUITER: RECRUITER_GROUP,
+    UserProfile.Roles.CANDIDATE: CANDIDATE_GROUP,
+}
+
+_INSTANCE_ATTR = '_user_roles'
+
+
+class UserRoles(NamedTuple):
+    role: Optional[str]
+    groups: FrozenSet[str]
+    is_superuser: bool = False
+    is_staff: bool = False
+
+    # Rôles par groupes (décorateurs, permissions DRF, redirection après connexion)
+    @property
+    def is_admin(self) -> bool:
+        return self.is_superuser or self.is_staff or ADMIN_GROUP in self.groups
+
+    @property
+    def is_recruiter(self) -> bool:
+        return self.is_admin or RECRUITER_GROUP in self.groups
+
+    @property
+    def is_candidate(self) -> bool:
+        return CANDIDATE_GROUP in self.groups
+
+    # Rôles par profil (API admin, scores)
+    @property
+    def has_admin_role(self) -> bool:
+        return self.is_superuser or self.is_staff or self.role == UserProfile.Roles.ADMIN
+
+    @property
+    def has_recruiter_role(self) -> bool:
+        return self.has_admin_role or self.role == UserProfile.Roles.RECRUITER
+
+
+ANONYMOUS_ROLES = UserRoles(role=None, groups=frozenset())
+
+
+def _cache_key(user_id: int) -> str:
+    return f"accounts:roles:{user_id}"
+
+
+def _cache_timeout() -> int:
+    return getattr(settings, 'ACCOUNTS_ROLES_CACHE_TIMEOUT', 0)
+
+
+def _load_role_and_groups(user_id: int):
+    rows = list(User.objects.filter(pk=user_id).values_list('groups__name', 'profile__role'))
+    role = rows[0][1] if rows else None
+    groups = frozenset(name for name, _ in rows if name)
+    return role, groups
+
+
+def get_user_roles(user) -> UserRoles:
+    """Retourne les rôles de ``user`` : une requête au plus par instance (et par TTL si le cache est actif)."""
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS_ROLES
+
+    roles = getattr(user, _INSTANCE_ATTR, None)
+    if roles is not None:
+        return roles
+
+    timeout = _cache_timeout()
+    cached = cache.get(_cache_key(user.pk)) if timeout else None
+    if cached is None:
+        cached = _load_role_and_groups(user.pk)
+        if timeout:
+            cache.set(_cache_key(user.pk), cached, timeout)
+
+    role, groups = cached
+    roles = UserRoles(role=role, groups=groups, is_superuser=user.is_superuser, is_staff=user.is_staff)
+    setattr(user, _INSTANCE_ATTR, roles)
+    return roles
+
+
+def request_roles(request) -> UserRoles:
+    """Rôles de l'utilisateur de ``request`` : ``request.roles`` (``UserRolesMiddleware``) s'il est posé."""
+    roles = getattr(request, 'roles', None)
+    return roles if roles is not None else get_user_roles(request.user)
+
+
+def invalidate_user_roles(user_id: int, user=None) -> None:
+    cache.delete(_cache_key(user_id))
+    if user is not None and hasattr(user, _INSTANCE_ATTR):
+        delattr(user, _INSTANCE_ATTR)
@@ -1,17 +1,58 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.contrib.auth.models import Group
-from .models import UserProfile
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from .authentication import invalidate_user_tokens, token_cache_key
+from .models import UserProfile, ApiToken
+from .permissions import ROLE_GROUPS, CANDIDATE_GROUP, invalidate_user_roles
 
 @receiver(post_save, sender=UserProfile)
 def assign_user_group(sender, instance, created, **kwargs):
     if created:
-        group_mapping = {
-            UserProfile.Roles.ADMIN: 'admin_group',
-            UserProfile.Roles.RECRUITER: 'recruteur_group',
-            UserProfile.Roles.CANDIDATE: 'candidat_group',
-        }
-        group_name = group_mapping.get(instance.role, 'candidat_group')
+        group_name = ROLE_GROUPS.get(instance.role, CANDIDATE_GROUP)
         group, _ = Group.objects.get_or_create(name=group_name)
         instance.user.groups.clear()
-        instance.user.groups.add(group)
\ No newline at end of file
+        instance.user.groups.add(group)
+
+
+def invalidate_principal(user_id, user=None):
+    """Rôles en cache et principaux des jetons d'API (qui embarquent l'utilisateur et ses rôles)."""
+    invalidate_user_roles(user_id, user)
+    invalidate_user_tokens(user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_roles_on_profile_change(sender, instance, **kwargs):
+    user = instance.user if UserProfile.user.is_cached(instance) else None
+    invalidate_principal(instance.user_id, user)
+
+
+@receiver(post_save, sender=User)
+def invalidate_principal_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    # ``is_active``, ``is_staff`` ou ``is_superuser`` ont pu changer ; la connexion ne touche que ``last_login``
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    invalidate_principal(instance.pk, instance)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_groups_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_principal(instance.pk, instance)
+    elif action == 'pre_clear':
+        # Groupe vidé : les membres ne sont connus qu'avant la suppression
+        for user_id in instance.user_set.values_list('pk', flat=True):
+            invalidate_principal(user_id)
+    else:
+        for user_id in pk_set or ():
+            invalidate_principal(user_id)
+
+
+@receiver(post_save, sender=ApiToken)
+@receiver(post_delete, sender=ApiToken)
+def invalidate_cached_api_token(sender, instance, **kwargs):
+    # Révocation/suppression depuis l'admin : le principal ne doit plus être servi par le cache
+    cache.delete(token_cache_key(instance.key_hash))
@@ -0,0 +1,77 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import AnonymousUser, User, Group
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from accounts.models import UserProfile
+from accounts import permissions as perms
+from accounts.middleware import UserRolesMiddleware
+
+
+class TestUserRoles(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = User.objects.create_user(username="rolesu", password="RecPassw0rd!")
+        UserProfile.objects.create(user=self.recruiter, role=UserProfile.Roles.RECRUITER)
+
+    def test_roles_resolved_once_per_instance(self):
+        user = User.objects.get(pk=self.recruiter.pk)
+        with self.assertNumQueries(1):
+            roles = perms.get_user_roles(user)
+            self.assertTrue(roles.is_recruiter)
+            self.assertFalse(roles.is_admin)
+            self.assertFalse(perms.get_user_roles(user).is_candidate)
+
+    @override_settings(ACCOUNTS_ROLES_CACHE_TIMEOUT=60)
+    def test_cross_request_cache_invalidated_on_group_change(self):
+        perms.get_user_roles(User.objects.get(pk=self.recruiter.pk))
+        with self.assertNumQueries(0):
+            self.assertTrue(perms.get_user_roles(User(pk=self.recruiter.pk)).is_recruiter)
+
+        admin_group, _ = Group.objects.get_or_create(name=perms.ADMIN_GROUP)
+        self.recruiter.groups.add(admin_group)
+
+        fresh = User.objects.get(pk=self.recruiter.pk)
+        self.assertTrue(perms.get_user_roles(fresh).is_admin)
+
+    def test_group_roles_ignore_profile_role(self):
+        self.recruiter.groups.clear()
+        roles = perms.get_user_roles(User.objects.get(pk=self.recruiter.pk))
+        self.assertFalse(roles.is_recruiter)
+        self.assertTrue(roles.has_recruiter_role)
+        self.assertFalse(roles.has_admin_role)
+
+
+class TestUserRolesMiddleware(SimpleTestCase):
+    def test_async_chain(self):
+        async def get_response(request):
+            return request.roles
+
+        middleware = UserRolesMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        self.assertFalse(async_to_sync(middleware)(request).is_admin)
+
+    def test_sync_chain(self):
+        middleware = UserRolesMiddleware(lambda request: request.roles)
+        self.assertFalse(iscoroutinefunction(middleware))
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        self.assertIs(middleware(request).role, None)
+
+    def test_roles_follow_user_set_after_middleware(self):
+        # Authentification DRF ou connexion : ``request.user`` change après le middleware
+        user = User(pk=1, username="later")
+        user._user_roles = perms.UserRoles(role=UserProfile.Roles.RECRUITER, groups=frozenset({perms.RECRUITER_GROUP}))
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        UserRolesMiddleware(lambda request: None)(request)
+        self.assertFalse(perms.request_roles(request).is_recruiter)
+        request.user = user
+        self.assertTrue(perms.request_roles(request).is_recruiter)
+
+    def test_request_roles_without_middleware(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        self.assertIs(perms.request_roles(request), perms.ANONYMOUS_ROLES)
@@ -1,10 +1,44 @@
 import logging
-from typing import Optional, List, Mapping, Union, Sequence
-from django.core.mail import EmailMultiAlternatives
+from typing import Optional, List, Mapping, Union, Sequence, Iterable, NamedTuple, Tuple
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EMAIL_BATCH_SIZE = 100
+
+
+class MailResult(NamedTuple):
+    recipient: str
+    sent: bool
+    error: Optional[str] = None
+
+
+def _build_message(
+        subject: str,
+        recipients: List[str],
+        template_txt: str,
+        context: Mapping,
+        html_template: Optional[str] = None,
+        from_email: Optional[str] = None,
+) -> EmailMultiAlternatives:
+    body_text = render_to_string(template_txt, context)
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=body_text,
+        to=recipients,
+        from_email=from_email
+    )
+
+    if html_template:
+        try:
+            body_html = render_to_string(html_template, context)
+            message.attach_alternative(body_html, "text/html")
+        except Exception as e:
+            logger.info("Template HTML '%s' introuvable ou erreur: %s", html_template, e)
+    return message
+
 
 def send_templated_email(
         subject: str,
@@ -18,26 +52,12 @@ def send_templated_email(
     recipients: List[str] = [to_emails] if isinstance(to_emails, str) else list(to_emails)
 
     try:
-        body_text = render_to_string(template_txt, context)
+        message = _build_message(subject, recipients, template_txt, context, html_template, from_email)
     except Exception as e:
         logger.error("Echec rendu template texte '%s': %s", template_txt, e, exc_info=True)
         return False
 
     try:
-        message = EmailMultiAlternatives(
-            subject=subject,
-            body=body_text,
-            to=recipients,
-            from_email=from_email
-        )
-
-        if html_template:
-            try:
-                body_html = render_to_string(html_template, context)
-                message.attach_alternative(body_html, "text/html")
-            except Exception as e:
-                logger.info("Template HTML '%s' introuvable ou erreur: %s", html_template, e)
-
         message.send(fail_silently=False)
         return True
     except Exception as e:
@@ -45,9 +65,67 @@ def send_templated_email(
         return False
 
 
+def send_mass_templated_email(
+        subject: str,
+        messages: Iterable[Tuple[str, Optional[Mapping]]],
+        template_txt: str,
+        html_template: Optional[str] = None,
+        from_email: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        connection=None,
+) -> List[MailResult]:
+    """Envoie un email par couple (destinataire, contexte) en réutilisant une connexion SMTP par lot.
+
+    Retourne un ``MailResult`` par message, dans l'ordre d'entrée. Une ``connection`` fournie par
+    l'appelant est ouverte au besoin mais jamais fermée ici : elle sert à tous les lots.
+    """
+    chunk_size = chunk_size or getattr(settings, 'EMAIL_BATCH_SIZE', DEFAULT_EMAIL_BATCH_SIZE)
+    results: List[Optional[MailResult]] = []
+    built: List[Tuple[int, EmailMultiAlternatives]] = []
+
+    for recipient, context in messages:
+        try:
+            message = _build_message(subject, [recipient], template_txt, context or {}, html_template, from_email)
+        except Exception as e:
+            logger.error("Echec rendu template texte '%s': %s", template_txt, e, exc_info=True)
+            results.append(MailResult(recipient, False, f"Rendu: {e}"))
+            continue
+        results.append(None)
+        built.append((len(results) - 1, message))
+
+    for start in range(0, len(built), chunk_size):
+        chunk = built[start:start + chunk_size]
+        conn = connection or get_connection(fail_silently=False)
+        try:
+            conn.open()
+        except Exception as e:
+            logger.error("Connexion au serveur email impossible: %s", e, exc_info=True)
+            for index, message in chunk:
+                results[index] = MailResult(message.to[0], False, f"Connexion: {e}")
+            continue
+
+        try:
+            for index, message in chunk:
+                message.connection = conn
+                try:
+                    message.send(fail_silently=False)
+                    results[index] = MailResult(message.to[0], True)
+                except Exception as e:
+                    logger.error("Echec envoi email vers %s: %s", message.to[0], e, exc_info=True)
+                    results[index] = MailResult(message.to[0], False, str(e))
+        finally:
+            if connection is None:
+                conn.close()
+
+    return results
+
+
 def send_welcome_email(user, extra_context: Optional[Mapping] = None) -> bool:
+    """Met l'email de bienvenue en file (envoyé par le worker ``send_outbox``)."""
+    from .outbox import queue_templated_email
+
+    # Contexte stocké en JSON dans l'outbox : valeurs simples seulement
     context = {
-        "user": user,
         "first_name": user.first_name or user.username,
         "last_name": user.last_name,
         "username": user.username,
@@ -58,10 +136,10 @@ def send_welcome_email(user, extra_context: Optional[Mapping] = None) -> bool:
     if extra_context:
         context.update(extra_context)
 
-    return send_templated_email(
+    return queue_templated_email(
         subject="Bienvenue sur RH System",
-        to_emails=user.email or [],
+        to_email=user.email,
         template_txt="accounts/emails/welcome_email.txt",
         context=context,
         html_template="accounts/emails/welcome_email.html",
-    )
\ No newline at end of file
+    ) is not None
\ No newline at end of file
@@ -15,6 +15,7 @@ from django.views.generic import FormView
 
 from .forms import CandidateSignUpForm, ProfileForm
 from .models import UserProfile
+from .permissions import request_roles
 
 
 class RoleBasedLoginView(LoginView):
@@ -23,12 +24,12 @@ class RoleBasedLoginView(LoginView):
     template_name = "accounts/login.html"
 
     def get_success_url(self):
-        user = self.request.user
+        roles = request_roles(self.request)
 
-        if user.is_superuser or user.is_staff or user.groups.filter(name='admin_group').exists():
+        if roles.is_admin:
             return reverse('admin:index')
 
-        if user.groups.filter(name='recruteur_group').exists():
+        if roles.is_recruiter:
             return reverse('recruitment:dashboard_recruteur')
 
         return reverse('accounts:profile')
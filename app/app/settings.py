@@ -31,6 +31,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.UserRolesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -78,9 +79,31 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    # CV et lettres : stockés une fois par contenu (SHA-256), voir recruitment.storage
+    'documents': {'BACKEND': 'recruitment.storage.ContentAddressedStorage'},
+}
+
 FILE_UPLOAD_PERMISSIONS = 0o644
 FILE_UPLOAD_DIRECTORY_PERMISSIONS = 0o755
 
+# Transfert des CV : 'django' (FileResponse), 'x-accel' (Nginx) ou 'x-sendfile' (Apache), voir recruitment.downloads
+DOWNLOAD_BACKEND = os.environ.get('DOWNLOAD_BACKEND', 'django')
+# Emplacement Nginx « internal » servant MEDIA_ROOT (mode x-accel)
+DOWNLOAD_ACCEL_PREFIX = os.environ.get('DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+# Durée de validité (secondes) des liens signés vers les documents
+DOCUMENT_URL_MAX_AGE = int(os.environ.get('DOCUMENT_URL_MAX_AGE', '600'))
+
+# Durée de vie (secondes) du compteur de notifications non lues en cache, voir recruitment.notifications
+NOTIFICATIONS_UNREAD_CACHE_TIMEOUT = int(os.environ.get('NOTIFICATIONS_UNREAD_CACHE_TIMEOUT', '300'))
+# Délai (jours) après lequel les notifications lues sont archivées (commande archive_notifications)
+NOTIFICATIONS_RETENTION_DAYS = int(os.environ.get('NOTIFICATIONS_RETENTION_DAYS', '90'))
+
+# Cache inter-requêtes des rôles (secondes, 0 = désactivé) ; invalidé à chaque changement de groupe/profil
+ACCOUNTS_ROLES_CACHE_TIMEOUT = int(os.environ.get('ACCOUNTS_ROLES_CACHE_TIMEOUT', '0'))
+
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'profile'
 LOGOUT_REDIRECT_URL = '/'
@@ -99,6 +122,8 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
+        # Après la session : un appel anonyme garde la réponse 403 (pas de 401 + WWW-Authenticate)
+        'accounts.authentication.HashedTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -107,6 +132,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Durée (secondes) de mise en cache du principal associé à un jeton d'API
+API_TOKEN_CACHE_TIMEOUT = int(os.environ.get('API_TOKEN_CACHE_TIMEOUT', '60'))
+
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
@@ -118,5 +146,10 @@ SERVER_EMAIL = os.environ.get('SERVER_EMAIL', DEFAULT_FROM_EMAIL)
 EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', '30'))
 EMAIL_SUBJECT_PREFIX = os.environ.get('EMAIL_SUBJECT_PREFIX', '[RH] ')
 
+# Outbox : les emails sont mis en file puis envoyés par `manage.py send_outbox`
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.environ.get('EMAIL_OUTBOX_BACKOFF_SECONDS', '60'))
+EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', '100'))
+
 if DEBUG:
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
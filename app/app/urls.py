@@ -16,8 +16,6 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 from recruitment.views import PosteListView
 
 urlpatterns = [
@@ -26,7 +24,5 @@ urlpatterns = [
     path('account/', include(('accounts.urls', 'accounts'), namespace='accounts')),
     path('recruitment/', include('recruitment.urls', namespace='recruitment')),
 ]
+# Les médias (CV, lettres) ne sont pas servis publiquement : voir recruitment.signed_urls
 
-# Configuration pour servir les fichiers médias en développement uniquement (Forcer le rechargement)
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
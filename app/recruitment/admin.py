@@ -1,17 +1,23 @@
 from django.contrib import admin, messages
-from django.db.models import QuerySet, Count
+from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.utils.html import format_html
 
 from accounts.models import UserProfile
-from .models import Poste, Candidature, Score, Notification
+from accounts.permissions import ADMIN_GROUP, RECRUITER_GROUP, request_roles
+from .models import (
+    Poste, Candidature, Score, Notification, BroadcastNotification, BroadcastNotificationArchive, NotificationArchive,
+)
+from .notifications import mark_queryset_read
+from .services import transition_candidatures
+from .signed_urls import signed_document_url
+from .stats import with_candidature_counts
 
 
 class BaseRecruitmentAdmin(admin.ModelAdmin):
     def has_module_permission(self, request):
-        return request.user.is_superuser or request.user.groups.filter(
-            name__in=['admin_group', 'recruteur_group']
-        ).exists()
+        roles = request_roles(request)
+        return roles.is_superuser or bool(roles.groups & {ADMIN_GROUP, RECRUITER_GROUP})
 
     def has_view_permission(self, request, obj=None):
         return self.has_module_permission(request)
@@ -35,7 +41,7 @@ class PosteAdmin(BaseRecruitmentAdmin):
 
     def get_queryset(self, request: HttpRequest) -> QuerySet:
         qs = super().get_queryset(request)
-        return qs.annotate(candidatures_count=Count('candidatures'))
+        return with_candidature_counts(qs)
 
     @admin.display(description="Nb. Candidatures", ordering='candidatures_count')
     def nombre_candidatures(self, obj: Poste) -> int:
@@ -54,7 +60,7 @@ class ScoreInline(admin.StackedInline):
 
 @admin.register(Candidature)
 class CandidatureAdmin(BaseRecruitmentAdmin):
-    list_display = ('candidat', 'poste', 'statut', 'date_soumission', 'apercu_cv')
+    list_display = ('candidat', 'poste', 'statut', 'date_soumission')
     list_filter = ('statut', 'poste__titre')
     search_fields = ('candidat__username', 'candidat__email', 'poste__titre')
     readonly_fields = ('candidat', 'poste', 'date_soumission')
@@ -62,25 +68,36 @@ class CandidatureAdmin(BaseRecruitmentAdmin):
     actions = ['marquer_en_revue', 'marquer_acceptee', 'marquer_refusee']
     inlines = [ScoreInline]
 
-    @admin.display(description="CV")
-    def apercu_cv(self, obj: Candidature) -> str:
-        if obj.cv_file:
-            return format_html('<a href="{url}" target="_blank">Voir CV</a>', url=obj.cv_file.url)
-        return "N/A"
+    def get_list_display(self, request: HttpRequest):
+        # Le lien signé dépend de l'utilisateur : colonne construite par requête (pas de lien /media/ public)
+        user_id = request.user.pk
+
+        @admin.display(description="CV")
+        def apercu_cv(obj: Candidature) -> str:
+            url = signed_document_url(obj.cv_file, user_id)
+            if url:
+                return format_html('<a href="{url}" target="_blank">Voir CV</a>', url=url)
+            return "N/A"
+
+        return [*super().get_list_display(request), apercu_cv]
+
+    def _changer_statut(self, queryset: QuerySet, statut: str) -> int:
+        # Un seul UPDATE ; statistiques et notifications suivent via le lot de changements émis
+        return len(transition_candidatures(queryset, statut))
 
     @admin.action(description="Marquer comme 'En revue'")
     def marquer_en_revue(self, request: HttpRequest, queryset: QuerySet):
-        updated = queryset.update(statut=Candidature.Statuts.EN_REVUE)
+        updated = self._changer_statut(queryset, Candidature.Statuts.EN_REVUE)
         self.message_user(request, f"{updated} candidatures mises à jour.", messages.SUCCESS)
 
     @admin.action(description="Marquer comme 'Acceptée'")
     def marquer_acceptee(self, request: HttpRequest, queryset: QuerySet):
-        updated = queryset.update(statut=Candidature.Statuts.ACCEPTEE)
+        updated = self._changer_statut(queryset, Candidature.Statuts.ACCEPTEE)
         self.message_user(request, f"{updated} candidatures acceptées.", messages.SUCCESS)
 
     @admin.action(description="Marquer comme 'Refusée'")
     def marquer_refusee(self, request: HttpRequest, queryset: QuerySet):
-        updated = queryset.update(statut=Candidature.Statuts.REFUSEE)
+        updated = self._changer_statut(queryset, Candidature.Statuts.REFUSEE)
         self.message_user(request, f"{updated} candidatures refusées.", messages.SUCCESS)
 
 
@@ -109,15 +126,47 @@ class NotificationAdmin(admin.ModelAdmin):
 
     @admin.action(description="Marquer les notifications sélectionnées comme lues")
     def marquer_comme_lu(self, request: HttpRequest, queryset: QuerySet):
-        updated = queryset.update(is_read=True)
+        updated = mark_queryset_read(queryset)
         self.message_user(request, f"{updated} notifications marquées comme lues.", messages.SUCCESS)
 
     def has_view_permission(self, request: HttpRequest, obj=None) -> bool:
-        return request.user.is_superuser or (hasattr(request.user, 'profile') and request.user.profile.role == UserProfile.Roles.ADMIN)
+        roles = request_roles(request)
+        return roles.is_superuser or roles.role == UserProfile.Roles.ADMIN
 
     def has_module_permission(self, request: HttpRequest) -> bool:
-        return request.user.is_superuser or (hasattr(request.user, 'profile') and request.user.profile.role == UserProfile.Roles.ADMIN)
+        return self.has_view_permission(request)
 
     has_add_permission = has_view_permission
     has_change_permission = has_view_permission
-    has_delete_permission = has_view_permission
\ No newline at end of file
+    has_delete_permission = has_view_permission
+
+
+@admin.register(BroadcastNotification)
+class BroadcastNotificationAdmin(NotificationAdmin):
+    list_display = ('audience', 'notification_type', 'message', 'created_at')
+    list_filter = ('audience', 'notification_type')
+    search_fields = ('message',)
+    actions = []
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(NotificationAdmin):
+    """Consultation seule des notifications archivées."""
+
+    list_display = ('user', 'notification_type', 'message', 'created_at', 'archived_at')
+    list_filter = ('notification_type',)
+    search_fields = ('message',)
+    date_hierarchy = 'created_at'
+    actions = []
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj=None) -> bool:
+        return False
+
+
+@admin.register(BroadcastNotificationArchive)
+class BroadcastNotificationArchiveAdmin(NotificationArchiveAdmin):
+    list_display = ('audience', 'notification_type', 'message', 'created_at', 'archived_at')
+    list_filter = ('audience', 'notification_type')
@@ -1,11 +1,31 @@
 from __future__ import annotations
+from datetime import timedelta
+
+from django.db import transaction
 from django.db.models import QuerySet
-from rest_framework import viewsets, permissions, parsers, filters
+from django.utils import timezone
+from rest_framework import viewsets, mixins, permissions, parsers, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework import permissions
-from accounts.models import UserProfile
-from .models import Poste, Candidature, Score
-from .serializers import PosteSerializer, CandidatureSerializer, ScoreSerializer
+from accounts.permissions import request_roles
+from .chunked_uploads import append_chunk, finalize_upload
+from .models import Poste, Candidature, Score, Notification, UploadSession
+from . import notifications
+from .exports import export_filename, export_queryset, parse_statuts, zip_response
+from .pagination import CandidatureCursorPagination, InboxCursorPagination, ScoreCursorPagination
+from .search import PosteSearchFilter
+from .skills import SkillsFilter
+from . import stats
+from .serializers import (
+    PosteSerializer, CandidatureSerializer, ScoreSerializer, BulkStatusSerializer, UploadSessionSerializer,
+    NotificationSerializer, MarkReadSerializer,
+)
+from .services import transition_candidatures
+from .uploads import document_upload_handlers, upload_errors
 
 
 # ---------------------
@@ -13,33 +33,20 @@ from .serializers import PosteSerializer, CandidatureSerializer, ScoreSerializer
 # ---------------------
 class IsAdmin(BasePermission):
     def has_permission(self, request, view) -> bool:
-        user = request.user
-        if not user or not user.is_authenticated:
-            return False
-        if user.is_superuser or user.is_staff:
-            return True
-        role = getattr(getattr(user, 'profile', None), 'role', None)
-        return role == UserProfile.Roles.ADMIN
+        return request_roles(request).has_admin_role
 
 
 class IsRecruiterOrAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and (
-            request.user.is_staff or
-            request.user.groups.filter(name__in=['admin_group', 'recruteur_group']).exists()
-        )
+        return request_roles(request).is_recruiter
 
 class IsCandidate(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.groups.filter(name='candidat_group').exists()
+        return request_roles(request).is_candidate
 
 class IsOwnerOrRecruiterAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return (
-            obj.candidat == request.user or
-            request.user.is_staff or
-            request.user.groups.filter(name__in=['admin_group', 'recruteur_group']).exists()
-        )
+        return obj.candidat_id == request.user.id or request_roles(request).is_recruiter
 
 
 
@@ -49,19 +56,33 @@ class IsOwnerOrRecruiterAdmin(permissions.BasePermission):
 class PosteViewSet(viewsets.ModelViewSet):
     queryset = Poste.objects.all()
     serializer_class = PosteSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    # Recherche plein texte (FTS5, classement bm25) ; ``ordering`` explicite prioritaire
+    filter_backends = [SkillsFilter, PosteSearchFilter, filters.OrderingFilter]
     search_fields = ['titre', 'description', 'competences_requises']
     ordering_fields = ['date_creation', 'titre']
 
     def get_permissions(self):
+        if self.action == 'export':
+            return [IsRecruiterOrAdmin()]
         if self.request.method in permissions.SAFE_METHODS:
             return [permissions.IsAuthenticated()]
         return [IsRecruiterOrAdmin()]
 
+    @action(detail=True, methods=['get'], filter_backends=[])
+    def export(self, request, pk=None):
+        """ZIP des CV et lettres du poste (``?statut=`` répétable), produit en flux."""
+        poste = self.get_object()
+        try:
+            statuts = parse_statuts(request.query_params.getlist('statut'))
+        except ValueError as exc:
+            raise ValidationError({'statut': f"Statut inconnu : {exc}"})
+        return zip_response(export_queryset(poste.pk, statuts), export_filename(poste))
+
 
 class CandidatureViewSet(viewsets.ModelViewSet):
     serializer_class = CandidatureSerializer
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
+    pagination_class = CandidatureCursorPagination
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['date_soumission', 'statut']
 
@@ -72,7 +93,7 @@ class CandidatureViewSet(viewsets.ModelViewSet):
         if not user.is_authenticated:
             return qs.none()
 
-        if user.is_staff or user.groups.filter(name__in=['admin_group', 'recruteur_group']).exists():
+        if request_roles(self.request).is_recruiter:
             return qs
 
         return qs.filter(candidat=user)
@@ -80,25 +101,150 @@ class CandidatureViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.request.method in SAFE_METHODS:
             return [permissions.IsAuthenticated()]
+        if self.action == 'bulk_status':
+            return [IsRecruiterOrAdmin()]
         if self.request.method == 'POST':
             # Seuls les candidats peuvent créer leur candidature
             return [IsCandidate()]
         # PATCH/PUT/DELETE: propriétaire ou recruteur/admin
         return [IsOwnerOrRecruiterAdmin()]
 
+    def initialize_request(self, request, *args, **kwargs):
+        drf_request = super().initialize_request(request, *args, **kwargs)
+        if self.action == 'create':
+            # Installé avant toute lecture du corps (authentification et CSRF comprises)
+            request.upload_handlers = document_upload_handlers(request)
+        return drf_request
+
+    def create(self, request, *args, **kwargs):
+        request.data  # lecture du corps par le gestionnaire d'upload
+        # Fichier refusé pendant la réception : le reste du corps n'a pas été lu
+        if errors := upload_errors(request):
+            raise ValidationError(errors)
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        # La candidature et les emails mis en file partagent la même transaction
+        with transaction.atomic():
+            serializer.save()
+
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Change le statut de plusieurs candidatures : permissions vérifiées une fois, un seul UPDATE."""
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        statut = serializer.validated_data['statut']
+
+        queryset = self.get_queryset().filter(pk__in=ids)
+        with transaction.atomic():
+            existing = set(queryset.values_list('id', flat=True))
+            changed = {change.candidature_id for change in transition_candidatures(queryset, statut)}
+
+        results = [
+            {'id': pk, 'result': 'updated' if pk in changed else 'unchanged' if pk in existing else 'not_found'}
+            for pk in ids
+        ]
+        return Response({'statut': statut, 'updated': len(changed), 'results': results})
+
 
 class ScoreViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ScoreSerializer
+    pagination_class = ScoreCursorPagination
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['date_analyse']
 
     def get_queryset(self) -> QuerySet:
         user = self.request.user
         qs = Score.objects.select_related('candidature', 'candidature__candidat', 'candidature__poste').all()
         if not user.is_authenticated:
             return qs.none()
-        if user.is_superuser or user.is_staff:
-            return qs
-        role = getattr(getattr(user, 'profile', None), 'role', None)
-        if role in (UserProfile.Roles.RECRUITER, UserProfile.Roles.ADMIN):
+        if request_roles(self.request).has_recruiter_role:
             return qs
         # Candidate: ne voir que le score de ses candidatures
-        return qs.filter(candidature__candidat_id=user.id)
\ No newline at end of file
+        return qs.filter(candidature__candidat_id=user.id)
+
+
+class StatsView(APIView):
+    """Statistiques de candidatures, lues dans les tables de cumul (coût indépendant du volume)."""
+
+    permission_classes = [IsRecruiterOrAdmin]
+    default_days = 30
+    max_days = 366
+
+    def get(self, request):
+        try:
+            days = min(max(int(request.query_params.get('jours', self.default_days)), 1), self.max_days)
+        except ValueError:
+            days = self.default_days
+        since = timezone.localdate() - timedelta(days=days - 1)
+        par_poste = stats.counts_by_poste()
+        return Response({
+            'par_statut': stats.status_counts(),
+            'par_poste': [
+                {'poste': poste_id, 'statuts': counts, 'total': sum(counts.values())}
+                for poste_id, counts in sorted(par_poste.items())
+            ],
+            'par_jour': [
+                {'jour': jour, 'total': total} for jour, total in stats.daily_submissions(since).items()
+            ],
+        })
+
+
+class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Notifications de l'utilisateur connecté et diffusions de ses audiences (les plus récentes d'abord)."""
+
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = InboxCursorPagination
+
+    def get_queryset(self) -> QuerySet:
+        return Notification.objects.filter(user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginator.paginate_sources({
+            'personal': self.get_queryset(),
+            'broadcast': notifications.visible_broadcasts(request.user),
+        }, request, view=self)
+        broadcasts = [item for item in page if item.source == 'broadcast']
+        if broadcasts:
+            last_read = notifications.last_read_broadcast(request.user.pk)
+            for item in broadcasts:
+                item.is_read = item.pk <= last_read
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = notifications.mark_read(
+            request.user, serializer.validated_data.get('ids'), serializer.validated_data.get('broadcast_ids'),
+        )
+        return Response({'updated': updated})
+
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        # Compteur en cache : pas de COUNT(*) pour les clients qui interrogent en boucle
+        return Response({'unread': notifications.unread_count(request.user)})
+
+
+class UploadSessionViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Envoi reprenable d'un document : session, ``PUT chunks/<n>/`` (corps brut), puis ``complete``."""
+
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsCandidate]
+
+    def get_queryset(self) -> QuerySet:
+        return UploadSession.objects.filter(candidature__candidat=self.request.user)
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, pk=None, index=None):
+        session = append_chunk(
+            self.get_object(), int(index), request.body, request.headers.get('X-Chunk-Sha256', ''),
+        )
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        candidature = finalize_upload(self.get_object())
+        return Response(CandidatureSerializer(candidature, context=self.get_serializer_context()).data)
@@ -0,0 +1,128 @@
+"""Envoi reprenable des documents : session, morceaux numérotés, finalisation.
+
+Chaque morceau est vérifié (SHA-256 fourni dans ``X-Chunk-Sha256``) puis écrit directement à sa
+position dans ``uploads/<session>.part`` du stockage des documents ; ``octets_recus`` n'avance
+qu'après l'écriture, c'est le point de reprise. À la finalisation, le fichier assemblé est
+déplacé (et non recopié) vers le champ ``cv_file`` ou ``lettre_motivation_file`` de la candidature.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+from functools import partial
+
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Candidature, UploadSession
+from .storage import document_storage
+from .validators import SIGNATURE_ERROR, SIGNATURE_LENGTH, has_valid_signature
+
+DEFAULT_CHUNK_SIZE = 512 * 1024
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+PART_DIR = 'uploads'
+READ_SIZE = 64 * 1024
+
+
+class ChunkConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Morceau inattendu."
+    default_code = 'conflict'
+
+
+class AssembledFile(File):
+    """Fichier déjà complet sur disque : le stockage le déplace au lieu de le recopier."""
+
+    def __init__(self, path: str, name: str, size: int, sha256: str):
+        super().__init__(None, name)
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def temporary_file_path(self) -> str:
+        return self.path
+
+    def chunks(self, chunk_size=None):
+        with open(self.path, 'rb') as source:
+            while chunk := source.read(chunk_size or READ_SIZE):
+                yield chunk
+
+
+def part_path(session: UploadSession) -> str:
+    return document_storage().path(os.path.join(PART_DIR, f'{session.pk}.part'))
+
+
+def next_chunk(session: UploadSession) -> int:
+    return session.octets_recus // session.taille_morceau
+
+
+def append_chunk(session: UploadSession, index: int, data: bytes, checksum: str) -> UploadSession:
+    """Écrit le morceau ``index`` s'il est le suivant attendu ; un morceau déjà confirmé est ignoré."""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.date_fin:
+            raise ValidationError("Cet envoi est déjà finalisé.")
+        expected = next_chunk(session)
+        if index < expected:
+            # Réponse perdue côté client : le morceau est déjà confirmé
+            return session
+        if index > expected or session.octets_recus == session.taille:
+            raise ChunkConflict(f"Morceau {expected} attendu (reprise à l'octet {session.octets_recus}).")
+        if not hmac.compare_digest(hashlib.sha256(data).hexdigest(), checksum.strip().lower()):
+            raise ValidationError({'checksum': "Somme de contrôle SHA-256 invalide pour ce morceau."})
+        end = session.octets_recus + len(data)
+        if end > session.taille or (len(data) != session.taille_morceau and end != session.taille):
+            raise ValidationError(f"Taille de morceau invalide (attendu : {session.taille_morceau} octets).")
+        if index == 0 and not has_valid_signature(session.nom_fichier, data[:SIGNATURE_LENGTH]):
+            raise ValidationError(SIGNATURE_ERROR)
+
+        path = part_path(session)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as part:
+            # Repart du dernier octet confirmé : un reste d'écriture interrompue est écrasé
+            part.seek(session.octets_recus)
+            part.write(data)
+            part.truncate()
+        session.octets_recus = end
+        session.save(update_fields=['octets_recus'])
+    return session
+
+
+def _remove_part(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def finalize_upload(session: UploadSession) -> Candidature:
+    """Rattache le fichier assemblé à la candidature ; l'ancien document est libéré après validation."""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().select_related('candidature').get(pk=session.pk)
+        if session.date_fin:
+            raise ValidationError("Cet envoi est déjà finalisé.")
+        if session.octets_recus != session.taille:
+            raise ValidationError(f"Envoi incomplet : {session.octets_recus}/{session.taille} octets reçus.")
+
+        path = part_path(session)
+        digest = hashlib.sha256()
+        with open(path, 'rb') as part:
+            while chunk := part.read(READ_SIZE):
+                digest.update(chunk)
+
+        candidature = session.candidature
+        fieldfile = getattr(candidature, session.champ)
+        # L'ancien document est libéré par le receveur ``release_replaced_documents``
+        fieldfile.save(
+            session.nom_fichier, AssembledFile(path, session.nom_fichier, session.taille, digest.hexdigest()),
+            save=False,
+        )
+        candidature.save(update_fields=[session.champ])
+        # Après la mise en place du blob par le stockage : une copie restante est un doublon
+        transaction.on_commit(partial(_remove_part, path))
+        session.date_fin = timezone.now()
+        session.save(update_fields=['date_fin'])
+    return candidature
@@ -0,0 +1,53 @@
+"""Textes des documents de candidature, mis en cache par SHA-256 du contenu."""
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import Dict, Iterable, Optional
+
+from .extraction import extract_file, safe_file_digest
+from .models import DocumentText
+
+MAP_CHUNK_SIZE = 16
+
+
+def document_texts(paths: Iterable[str], executor: Optional[Executor] = None) -> Dict[str, str]:
+    """Retourne {chemin: texte}. Seuls les contenus jamais vus sont extraits (une fois par contenu).
+
+    Les calculs (hachage, extraction) passent par ``executor`` s'il est fourni.
+    """
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return {}
+    if executor:
+        def mapper(fn, items):
+            return executor.map(fn, items, chunksize=MAP_CHUNK_SIZE)
+    else:
+        mapper = map
+
+    digests = {}
+    for path, result in zip(paths, mapper(safe_file_digest, paths)):
+        if result is not None:
+            digests[path] = result[0]
+
+    known = dict(
+        DocumentText.objects.filter(sha256__in=set(digests.values())).values_list('sha256', 'texte')
+    )
+    # Un même contenu présent sous plusieurs chemins n'est extrait qu'une fois
+    to_extract = {}
+    for path, sha256 in digests.items():
+        if sha256 not in known:
+            to_extract.setdefault(sha256, path)
+
+    if to_extract:
+        new_rows = []
+        for result in mapper(extract_file, list(to_extract.values())):
+            if result is None:
+                # Fichier devenu illisible : texte vide, rien en cache (nouvel essai au prochain passage)
+                continue
+            sha256, size, texte = result
+            known[sha256] = texte
+            new_rows.append(DocumentText(sha256=sha256, taille=size, texte=texte))
+        DocumentText.objects.bulk_create(new_rows, ignore_conflicts=True)
+
+    return {path: known.get(sha256, '') for path, sha256 in digests.items()}
+
@@ -0,0 +1,152 @@
+"""Envoi des documents de candidature après contrôle d'accès.
+
+``DOWNLOAD_BACKEND`` choisit qui transfère les octets :
+
+- ``django`` (défaut) : le worker Python lit le fichier (``FileResponse``) ;
+- ``x-accel`` : Nginx, via l'en-tête ``X-Accel-Redirect`` vers ``DOWNLOAD_ACCEL_PREFIX``
+  (emplacement ``internal`` qui pointe sur ``MEDIA_ROOT``) ;
+- ``x-sendfile`` : Apache (mod_xsendfile) / Lighttpd, via ``X-Sendfile`` et le chemin absolu.
+
+Dans tous les cas Django répond lui-même 304/412 (``ETag``, ``Last-Modified``) sans lire le fichier.
+Les requêtes ``Range`` sont servies en 206 par Django en mode ``django``, par le proxy sinon.
+"""
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+BACKEND_DJANGO = 'django'
+BACKEND_X_ACCEL = 'x-accel'
+BACKEND_X_SENDFILE = 'x-sendfile'
+BACKENDS = (BACKEND_DJANGO, BACKEND_X_ACCEL, BACKEND_X_SENDFILE)
+
+CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _backend() -> str:
+    backend = getattr(settings, 'DOWNLOAD_BACKEND', BACKEND_DJANGO)
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(f"DOWNLOAD_BACKEND doit valoir {', '.join(BACKENDS)} (reçu : {backend!r}).")
+    return backend
+
+
+def file_etag(size: int, mtime_ns: int) -> str:
+    # Taille + date de modification : pas de lecture du contenu pour calculer l'ETag
+    return f'"{size:x}-{mtime_ns:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(début, fin incluse) d'une plage ``bytes=`` unique ; None si absente, multiple ou invalide.
+
+    Lève ``ValueError`` si la plage est bien formée mais hors du fichier (416).
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _range_applies(request, etag: str, mtime: int) -> bool:
+    """``If-Range`` : la plage n'est servie que si le fichier n'a pas changé depuis."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and mtime <= since
+
+
+def _stream(path: str, start: int, length: int):
+    with open(path, 'rb') as fileobj:
+        fileobj.seek(start)
+        while length > 0:
+            chunk = fileobj.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, fieldfile, as_attachment: bool = True, filename: Optional[str] = None) -> HttpResponse:
+    """Répond avec le contenu de ``fieldfile`` (``FieldFile`` d'un stockage local)."""
+    return serve_stored_file(request, fieldfile.storage, fieldfile.name, as_attachment, filename)
+
+
+def serve_stored_file(
+        request, storage, name: str, as_attachment: bool = True, filename: Optional[str] = None,
+) -> HttpResponse:
+    """Comme ``serve_file``, à partir du stockage et du nom : aucun modèle n'a besoin d'être chargé."""
+    try:
+        path = storage.path(name)
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError, ValueError):
+        raise Http404("Fichier non trouvé sur le disque.")
+
+    size = stat.st_size
+    mtime = int(stat.st_mtime)
+    etag = file_etag(size, stat.st_mtime_ns)
+    filename = filename or os.path.basename(name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    def finalize(response: HttpResponse) -> HttpResponse:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(mtime)
+        response['Accept-Ranges'] = 'bytes'
+        # Document privé : le cache du navigateur revalide, les caches partagés ne stockent rien
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if conditional is not None:
+        return finalize(conditional)
+
+    disposition = content_disposition_header(as_attachment, filename)
+    backend = _backend()
+    if backend != BACKEND_DJANGO:
+        response = HttpResponse(content_type=content_type)
+        if backend == BACKEND_X_ACCEL:
+            relative = os.path.relpath(path, settings.MEDIA_ROOT)
+            response['X-Accel-Redirect'] = settings.DOWNLOAD_ACCEL_PREFIX.rstrip('/') + '/' + quote(relative)
+        else:
+            response['X-Sendfile'] = path
+        response['Content-Disposition'] = disposition
+        return finalize(response)
+
+    try:
+        byte_range = parse_range(request.META.get('HTTP_RANGE', ''), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return finalize(response)
+
+    if byte_range and _range_applies(request, etag, mtime):
+        start, end = byte_range
+        response = StreamingHttpResponse(_stream(path, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Disposition'] = disposition
+        return finalize(response)
+
+    response = FileResponse(open(path, 'rb'), as_attachment=as_attachment, filename=filename, content_type=content_type)
+    return finalize(response)
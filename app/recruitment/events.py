@@ -0,0 +1,151 @@
+"""Diffusion en direct (Server-Sent Events) des notifications et changements de statut.
+
+``hub`` est un pub/sub en mémoire, propre au processus : chaque connexion SSE est une coroutine
+abonnée avec sa file ``asyncio`` (pas de thread par connexion). Les publications viennent du code
+synchrone (``services.deliver``, changements de statut), après validation de la transaction, et
+sont remises dans la boucle d'événements par ``call_soon_threadsafe``.
+
+L'``id`` d'un événement est celui de la notification : à la reconnexion, ``Last-Event-ID`` permet de
+rejouer depuis la base ce qui a été manqué, quel que soit le processus qui a servi la connexion
+précédente. Les événements ``candidature`` (sans ``id``) ne sont pas rejoués : leur notification l'est.
+Les diffusions (``broadcast``) n'ont pas non plus d'``id`` : leur numérotation est distincte de celle
+des notifications ; après une reconnexion, la boîte de réception de l'API les liste.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, NamedTuple, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+
+from .models import BroadcastNotification, Notification
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+QUEUE_SIZE = 100
+REPLAY_LIMIT = 100
+
+
+class Event(NamedTuple):
+    id: Optional[int]
+    event: str
+    data: Dict[str, Any]
+
+    def encode(self) -> bytes:
+        lines = [f'id: {self.id}'] if self.id is not None else []
+        lines += [f'event: {self.event}', f'data: {json.dumps(self.data, ensure_ascii=False)}']
+        return ('\n'.join(lines) + '\n\n').encode()
+
+
+def notification_event(notification: Notification) -> Event:
+    return Event(notification.pk, 'notification', {
+        'id': notification.pk,
+        'notification_type': notification.notification_type,
+        'message': notification.message,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+    })
+
+
+def broadcast_event(notification: BroadcastNotification) -> Event:
+    return Event(None, 'broadcast', {
+        'id': notification.pk,
+        'notification_type': notification.notification_type,
+        'message': notification.message,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+    })
+
+
+class Subscription:
+    """File d'un client ; un client trop lent est déconnecté (il se reconnecte avec ``Last-Event-ID``)."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+
+    def put(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # ``None`` termine le flux
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class NotificationHub:
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def connections(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id: int, event: Event) -> None:
+        """Utilisable depuis n'importe quel thread ; sans abonné, ne fait rien."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # Boucle fermée (arrêt du serveur)
+                self.unsubscribe(subscription)
+
+    def publish_on_commit(self, events: Iterable[tuple]) -> None:
+        """``events`` : (user_id, Event), publiés une fois la transaction validée."""
+        events = list(events)
+        if events:
+            transaction.on_commit(lambda: [self.publish(user_id, event) for user_id, event in events])
+
+
+hub = NotificationHub()
+
+
+def _missed_notifications(user_id: int, last_id: int):
+    return list(Notification.objects.filter(user_id=user_id, pk__gt=last_id).order_by('pk')[:REPLAY_LIMIT])
+
+
+async def event_stream(user_id: int, last_event_id: Optional[int]) -> AsyncIterator[bytes]:
+    subscription = hub.subscribe(user_id)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'.encode()
+        # Abonné avant le rattrapage : rien n'est perdu entre les deux, les doublons sont écartés
+        replayed = last_event_id or 0
+        if last_event_id is not None:
+            for notification in await sync_to_async(_missed_notifications)(user_id, last_event_id):
+                yield notification_event(notification).encode()
+                replayed = notification.pk
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b': ping\n\n'
+                continue
+            if event is None:
+                break
+            if event.id is not None and event.id <= replayed:
+                continue
+            yield event.encode()
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,125 @@
+"""Export ZIP des CV et lettres de motivation d'un poste, produit à la volée.
+
+L'archive est écrite dans un tampon non positionnable (``zipfile`` ajoute alors un descripteur de
+données après chaque fichier) qui est vidé vers le client à chaque bloc : ni fichier temporaire,
+ni archive en mémoire, quel que soit le nombre ou la taille des documents.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import zipfile
+from typing import Iterable, Iterator, List, Optional, Set
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.utils.text import slugify
+
+from .models import Candidature
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+DOCUMENTS = (('cv_file', 'cv'), ('lettre_motivation_file', 'lettre'))
+
+
+class _StreamBuffer:
+    """Tampon en écriture seule : sans ``tell``/``seek``, ``zipfile`` écrit en flux."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parse_statuts(values: Iterable[str]) -> List[str]:
+    """Statuts demandés (``?statut=`` répétable). Lève ``ValueError`` sur un statut inconnu."""
+    statuts = [value for value in values if value]
+    unknown = set(statuts) - set(Candidature.Statuts.values)
+    if unknown:
+        raise ValueError(', '.join(sorted(unknown)))
+    return statuts
+
+
+def export_queryset(poste_id: int, statuts: Optional[List[str]] = None) -> QuerySet:
+    queryset = Candidature.objects.filter(poste_id=poste_id)
+    if statuts:
+        queryset = queryset.filter(statut__in=statuts)
+    return (
+        queryset.select_related('candidat')
+        .only('id', 'date_soumission', 'cv_file', 'lettre_motivation_file',
+              'candidat__username', 'candidat__first_name', 'candidat__last_name')
+        .order_by('date_soumission', 'id')
+    )
+
+
+def _local(moment):
+    return timezone.localtime(moment) if timezone.is_aware(moment) else moment
+
+
+def entry_name(candidature: Candidature, kind: str, filename: str, used: Set[str]) -> str:
+    """``nom-prenom_AAAA-MM-JJ_cv.pdf`` ; suffixe numérique en cas d'homonyme le même jour."""
+    candidat = candidature.candidat
+    person = slugify(candidat.get_full_name()) or slugify(candidat.username) or f'candidat-{candidat.pk}'
+    day = _local(candidature.date_soumission).date()
+    stem, ext = f'{person}_{day:%Y-%m-%d}_{kind}', os.path.splitext(filename)[1].lower()
+    name, counter = f'{stem}{ext}', 2
+    while name in used:
+        name, counter = f'{stem}-{counter}{ext}', counter + 1
+    used.add(name)
+    return name
+
+
+def iter_zip(candidatures: QuerySet) -> Iterator[bytes]:
+    """Produit l'archive bloc par bloc ; les documents absents du disque sont ignorés."""
+    buffer = _StreamBuffer()
+    used: Set[str] = set()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for candidature in candidatures.iterator(chunk_size=200):
+            for field, kind in DOCUMENTS:
+                fieldfile = getattr(candidature, field)
+                if not fieldfile:
+                    continue
+                try:
+                    source = fieldfile.storage.open(fieldfile.name, 'rb')
+                except (FileNotFoundError, NotADirectoryError):
+                    logger.warning("Export ZIP : fichier absent %s (candidature %s)", fieldfile.name, candidature.pk)
+                    continue
+                info = zipfile.ZipInfo(
+                    entry_name(candidature, kind, fieldfile.name, used),
+                    date_time=_local(candidature.date_soumission).timetuple()[:6],
+                )
+                info.compress_type = zipfile.ZIP_DEFLATED
+                # Taille connue : ``zipfile`` choisit seul le format ZIP64 pour les gros fichiers
+                info.file_size = fieldfile.storage.size(fieldfile.name)
+                with source, archive.open(info, 'w') as target:
+                    while chunk := source.read(CHUNK_SIZE):
+                        target.write(chunk)
+                        if data := buffer.pop():
+                            yield data
+                if data := buffer.pop():
+                    yield data
+    yield buffer.pop()
+
+
+def zip_response(candidatures: QuerySet, filename: str) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(iter_zip(candidatures), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
+def export_filename(poste) -> str:
+    return f"candidatures-{slugify(poste.titre) or poste.pk}-{timezone.localdate():%Y-%m-%d}.zip"
@@ -0,0 +1,134 @@
+"""Extraction du texte des documents de candidature (PDF, DOC, DOCX), sans dépendance externe.
+
+Ce module ne dépend pas de Django : il est utilisé dans les processus de calcul.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import zipfile
+import zlib
+from typing import BinaryIO, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCUMENT_EXTENSIONS = ('.pdf', '.doc', '.docx')
+CHUNK_SIZE = 64 * 1024
+
+_PDF_STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+_PDF_TEXT_RE = re.compile(rb'(?:\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)\s*(?:Tj|\'|")|\[(?:\\.|[^\]])*\]\s*TJ', re.S)
+_PDF_STRING_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)|<([0-9A-Fa-f\s]*)>', re.S)
+
+
+def extract_docx(fileobj: BinaryIO) -> str:
+    with zipfile.ZipFile(fileobj) as archive:
+        xml = archive.read('word/document.xml')
+    root = ElementTree.fromstring(xml)
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NS}p'):
+        texts = [node.text or '' for node in paragraph.iter(f'{WORD_NS}t')]
+        if texts:
+            paragraphs.append(''.join(texts))
+    return '\n'.join(paragraphs)
+
+
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'', b'f': b''}
+
+
+def _pdf_unescape(raw: bytes) -> str:
+    raw = re.sub(rb'\\([nrtbf()\\])', lambda m: _PDF_ESCAPES.get(m.group(1), m.group(1)), raw)
+    return raw.decode('latin-1')
+
+
+def _pdf_string(literal: bytes, hexa: bytes) -> str:
+    if not hexa:
+        return _pdf_unescape(literal)
+    digits = re.sub(rb'\s', b'', hexa).decode()
+    if len(digits) % 2:
+        # Chiffre final manquant : complété par 0 (spécification PDF)
+        digits += '0'
+    raw = bytes.fromhex(digits)
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', errors='ignore')
+    return raw.decode('latin-1')
+
+
+def extract_pdf(data: bytes) -> str:
+    chunks = []
+    for match in _PDF_STREAM_RE.finditer(data):
+        stream = match.group(1)
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        for operator in _PDF_TEXT_RE.finditer(stream):
+            chunks.append(''.join(_pdf_string(literal, hexa) for literal, hexa in _PDF_STRING_RE.findall(operator.group(0))))
+    return '\n'.join(chunks)
+
+
+def extract_doc(data: bytes) -> str:
+    # Word 97-2003 : le texte est stocké en UTF-16LE ou en CP1252 dans le flux OLE
+    runs = re.findall(rb'(?:[\x20-\x7e\xc0-\xff]\x00){4,}', data)
+    if runs:
+        return '\n'.join(run.decode('utf-16-le') for run in runs)
+    return '\n'.join(run.decode('cp1252') for run in re.findall(rb'[\x20-\x7e\xc0-\xff]{4,}', data))
+
+
+def extract_text(source: Union[str, BinaryIO], name: str = '') -> str:
+    """Extrait le texte d'un fichier (chemin ou objet fichier binaire). Retourne '' si illisible."""
+    name = (name or (source if isinstance(source, str) else getattr(source, 'name', '')) or '').lower()
+    fileobj = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        if name.endswith('.docx'):
+            return extract_docx(fileobj)
+        data = fileobj.read()
+        if name.endswith('.pdf') or data.startswith(b'%PDF'):
+            return extract_pdf(data)
+        if name.endswith('.doc'):
+            return extract_doc(data)
+        return data.decode('utf-8', errors='ignore')
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError, OSError, ValueError):
+        return ''
+    finally:
+        if isinstance(source, str):
+            fileobj.close()
+
+
+def file_digest(path: str) -> Tuple[str, int]:
+    """SHA-256 et taille d'un fichier, lu par blocs (mémoire constante)."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as fileobj:
+        for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def safe_file_digest(path: str) -> Optional[Tuple[str, int]]:
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
+
+
+def extract_file(path: str) -> Optional[Tuple[str, int, str]]:
+    """Point d'entrée des processus d'extraction : (sha256, taille, texte).
+
+    None si le fichier est illisible (supprimé ou déplacé depuis le hachage) : document en échec,
+    comme un contenu impossible à analyser, sans interrompre le lot.
+    """
+    try:
+        sha256, size = file_digest(path)
+        return sha256, size, extract_text(path)
+    except OSError:
+        return None
+
+
+def iter_documents(root: str):
+    """Chemins des documents (PDF, DOC, DOCX) sous ``root``."""
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(DOCUMENT_EXTENSIONS):
+                yield os.path.join(dirpath, filename)
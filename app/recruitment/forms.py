@@ -1,4 +1,8 @@
+from datetime import datetime, time, timedelta
+
 from django import forms
+from django.db import models
+from django.utils import timezone
 from .models import Candidature, Poste
 
 
@@ -51,4 +55,64 @@ class CandidatureStatusForm(forms.ModelForm):
         }
         labels = {
             'statut': 'Nouveau statut de la candidature',
-        }
\ No newline at end of file
+        }
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+FILTER_INPUT_CLASS = 'mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-primary focus:ring-primary sm:text-sm'
+
+
+class DashboardFilterForm(forms.Form):
+    """Filtres (paramètres GET) du tableau de bord recruteur. Les valeurs invalides sont ignorées."""
+
+    class Tri(models.TextChoices):
+        DATE = "date", "Plus récentes d'abord"
+        SCORE = "score", "Meilleur score d'abord"
+
+    statut = forms.ChoiceField(
+        required=False, choices=[('', 'Tous les statuts')] + Candidature.Statuts.choices,
+        widget=forms.Select(attrs={'class': FILTER_INPUT_CLASS}),
+    )
+    poste = forms.TypedChoiceField(
+        required=False, coerce=int, empty_value=None,
+        widget=forms.Select(attrs={'class': FILTER_INPUT_CLASS}),
+    )
+    date_debut = forms.DateField(
+        required=False, label="Reçues à partir du",
+        widget=forms.DateInput(attrs={'type': 'date', 'class': FILTER_INPUT_CLASS}),
+    )
+    date_fin = forms.DateField(
+        required=False, label="Jusqu'au",
+        widget=forms.DateInput(attrs={'type': 'date', 'class': FILTER_INPUT_CLASS}),
+    )
+    tri = forms.ChoiceField(
+        required=False, choices=Tri.choices, label="Trier par",
+        widget=forms.Select(attrs={'class': FILTER_INPUT_CLASS}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Une seule requête pour la liste des postes ; la validation réutilise ces choix
+        self.fields['poste'].choices = [('', 'Tous les postes')] + list(
+            Poste.objects.order_by('titre').values_list('id', 'titre')
+        )
+
+    def filters(self) -> dict:
+        """Filtres valides, hors statut (les compteurs par statut sont calculés sur cet ensemble)."""
+        self.is_valid()
+        data = getattr(self, 'cleaned_data', {})
+        filters = {}
+        if data.get('poste'):
+            filters['poste_id'] = data['poste']
+        # Bornes en datetime (et non ``__date``) pour que l'index sur date_soumission serve
+        if data.get('date_debut'):
+            filters['date_soumission__gte'] = _start_of_day(data['date_debut'])
+        if data.get('date_fin'):
+            filters['date_soumission__lt'] = _start_of_day(data['date_fin'] + timedelta(days=1))
+        return filters
+
+    def value(self, name):
+        self.is_valid()
+        return getattr(self, 'cleaned_data', {}).get(name) or None
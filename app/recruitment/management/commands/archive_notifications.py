@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruitment.retention import DEFAULT_BATCH_SIZE, archive_broadcasts, archive_notifications
+
+
+class Command(BaseCommand):
+    help = "Archive par lots les notifications (et diffusions) lues plus anciennes que le délai de rétention"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Délai de rétention (NOTIFICATIONS_RETENTION_DAYS par défaut)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=0.0, help="Pause en secondes entre deux lots")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        totals = {}
+        for label, batches in (
+            ('notifications', archive_notifications(days=options['days'], batch_size=options['batch_size'])),
+            ('diffusions', archive_broadcasts(days=options['days'], batch_size=options['batch_size'])),
+        ):
+            totals[label] = 0
+            for archived in batches:
+                totals[label] += archived
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"{totals[label]} {label}...")
+                if options['pause']:
+                    time.sleep(options['pause'])
+
+        total = sum(totals.values())
+        elapsed = time.monotonic() - started or 1e-9
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['notifications']} notifications et {totals['diffusions']} diffusions archivées "
+            f"en {elapsed:.1f}s ({total / elapsed:.1f} lignes/s)."
+        ))
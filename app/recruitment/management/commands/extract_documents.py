@@ -0,0 +1,55 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recruitment.documents import document_texts
+from recruitment.extraction import iter_documents
+
+
+class Command(BaseCommand):
+    help = "Extrait le texte de tous les documents du dossier media (cache par SHA-256 du contenu)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', default=None, help="Dossier à parcourir (MEDIA_ROOT par défaut)")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        root = options['root'] or str(settings.MEDIA_ROOT)
+        self.verbosity = options['verbosity']
+        started = time.monotonic()
+        files = volume = 0
+
+        pool = None
+        if options['workers'] > 1:
+            pool = ProcessPoolExecutor(options['workers'], mp_context=multiprocessing.get_context('spawn'))
+        try:
+            batch = []
+            for path in iter_documents(root):
+                batch.append(path)
+                if len(batch) >= options['batch_size']:
+                    files, volume = self._process(batch, pool, files, volume)
+                    batch = []
+            if batch:
+                files, volume = self._process(batch, pool, files, volume)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        elapsed = time.monotonic() - started or 1e-9
+        self.stdout.write(self.style.SUCCESS(
+            f"{files} documents traités en {elapsed:.1f}s "
+            f"({files / elapsed:.1f} fichiers/s, {volume / elapsed / 1024 / 1024:.2f} Mo/s)."
+        ))
+
+    def _process(self, batch, pool, files, volume):
+        texts = document_texts(batch, pool)
+        volume += sum(os.path.getsize(path) for path in texts)
+        files += len(texts)
+        if self.verbosity > 1:
+            self.stdout.write(f"{files} documents...")
+        return files, volume
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from recruitment.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcule entièrement les statistiques de candidatures (par poste/statut et par jour)"
+
+    def handle(self, *args, **options):
+        statuts, jours = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(f"{statuts} compteurs poste/statut et {jours} compteurs journaliers recalculés."))
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from recruitment.documents import document_texts
+from recruitment.models import Candidature, Poste, Score
+from recruitment.scoring import build_poste_profiles, init_worker, score_batch
+
+
+class Command(BaseCommand):
+    help = "Calcule Score.score_ia / recommandation_ia (TF-IDF CV ↔ poste) par lots, sur un pool de processus"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--poste', type=int, action='append', dest='postes', help="Limiter à ce(s) poste(s)")
+        parser.add_argument('--missing-only', action='store_true', help="Ignorer les candidatures déjà scorées")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        postes = Poste.objects.all()
+        if options['postes']:
+            postes = postes.filter(pk__in=options['postes'])
+        profiles, idf = build_poste_profiles(postes.values('id', 'description', 'competences_requises'))
+
+        candidatures = Candidature.objects.filter(poste_id__in=list(profiles)).exclude(cv_file='').exclude(cv_file__isnull=True)
+        if options['missing_only']:
+            candidatures = candidatures.filter(score__isnull=True)
+
+        total = 0
+        if options['workers'] <= 1:
+            init_worker(profiles, idf)
+            for batch in self._batches(candidatures, options['batch_size']):
+                total += self._save(score_batch(self._with_texts(batch)))
+        else:
+            # 'spawn' : les processus de calcul n'héritent ni des connexions à la base ni de l'état Django
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(
+                    options['workers'], mp_context=context, initializer=init_worker, initargs=(profiles, idf)
+            ) as pool:
+                for batch in self._batches(candidatures, options['batch_size']):
+                    # Hachage/extraction puis scoring : chaque étape est répartie sur le pool
+                    items = self._with_texts(batch, pool)
+                    size = max(1, len(items) // options['workers'])
+                    for results in pool.map(score_batch, [items[i:i + size] for i in range(0, len(items), size)]):
+                        total += self._save(results)
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else total
+        self.stdout.write(self.style.SUCCESS(f"{total} candidatures scorées en {elapsed:.1f}s ({rate:.0f}/s)."))
+
+    def _batches(self, queryset, batch_size):
+        """Parcourt les candidatures par clé primaire croissante (pas d'OFFSET) et produit les lots à scorer."""
+        last_pk = 0
+        while True:
+            rows = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'poste_id', 'cv_file', 'lettre_motivation_file')[:batch_size]
+            )
+            if not rows:
+                return
+            last_pk = rows[-1][0]
+            yield [(pk, poste_id, self._paths(cv, lettre)) for pk, poste_id, cv, lettre in rows]
+
+    def _with_texts(self, batch, executor=None):
+        texts = document_texts((path for _, _, paths in batch for path in paths), executor)
+        return [
+            (pk, poste_id, '\n'.join(texts.get(path, '') for path in paths))
+            for pk, poste_id, paths in batch
+        ]
+
+    def _paths(self, *names):
+        storage = Candidature._meta.get_field('cv_file').storage
+        return [storage.path(name) for name in names if name]
+
+    def _save(self, results) -> int:
+        if not results:
+            return 0
+        Score.objects.bulk_create(
+            [
+                Score(candidature_id=pk, score_ia=Decimal(str(score)), recommandation_ia=recommandation)
+                for pk, score, recommandation in results
+            ],
+            update_conflicts=True,
+            unique_fields=['candidature'],
+            update_fields=['score_ia', 'recommandation_ia', 'date_analyse'],
+        )
+        return len(results)
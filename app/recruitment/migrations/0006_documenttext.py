@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0005_poste_type_contrat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('taille', models.BigIntegerField()),
+                ('texte', models.TextField(blank=True)),
+                ('date_extraction', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
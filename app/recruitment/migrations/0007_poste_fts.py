@@ -0,0 +1,61 @@
+from django.db import migrations
+
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE recruitment_poste_fts USING fts5(
+        titre, description, competences_requises,
+        content='recruitment_poste', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER recruitment_poste_fts_ai AFTER INSERT ON recruitment_poste BEGIN
+        INSERT INTO recruitment_poste_fts(rowid, titre, description, competences_requises)
+        VALUES (new.id, new.titre, new.description, new.competences_requises);
+    END
+    """,
+    """
+    CREATE TRIGGER recruitment_poste_fts_ad AFTER DELETE ON recruitment_poste BEGIN
+        INSERT INTO recruitment_poste_fts(recruitment_poste_fts, rowid, titre, description, competences_requises)
+        VALUES ('delete', old.id, old.titre, old.description, old.competences_requises);
+    END
+    """,
+    """
+    CREATE TRIGGER recruitment_poste_fts_au AFTER UPDATE OF titre, description, competences_requises
+    ON recruitment_poste BEGIN
+        INSERT INTO recruitment_poste_fts(recruitment_poste_fts, rowid, titre, description, competences_requises)
+        VALUES ('delete', old.id, old.titre, old.description, old.competences_requises);
+        INSERT INTO recruitment_poste_fts(rowid, titre, description, competences_requises)
+        VALUES (new.id, new.titre, new.description, new.competences_requises);
+    END
+    """,
+    "INSERT INTO recruitment_poste_fts(recruitment_poste_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS recruitment_poste_fts_au",
+    "DROP TRIGGER IF EXISTS recruitment_poste_fts_ad",
+    "DROP TRIGGER IF EXISTS recruitment_poste_fts_ai",
+    "DROP TABLE IF EXISTS recruitment_poste_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        # Index FTS5 propre à SQLite : les autres moteurs utilisent le repli icontains
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0006_documenttext'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FTS_SQL), _run(DROP_SQL)),
+    ]
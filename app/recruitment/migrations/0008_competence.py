@@ -0,0 +1,81 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:35
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Copie figée de recruitment.scoring.parse_skills : la migration ne doit pas suivre le code courant
+STOP_WORDS = frozenset("""
+    a au aux avec ce ces dans de des du elle en et eux il je la le les leur lui ma mais me meme mes moi mon ne nos
+    notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton tu un une vos votre vous y
+    an and are as at be by for from has in is it of on or that the to was were will with
+""".split())
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+SKILL_SPLIT_RE = re.compile(r'[,;\n/|•·]+|\s+-\s+|\bet\b|\band\b')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(normalize(text)) if (len(t) > 1 or t in ('c', 'r')) and t not in STOP_WORDS]
+
+
+def parse_skills(raw):
+    skills = []
+    for part in SKILL_SPLIT_RE.split(normalize(raw)):
+        skill = ' '.join(tokenize(part))
+        if skill and skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def index_existing_postes(apps, schema_editor):
+    Competence = apps.get_model('recruitment', 'Competence')
+    Poste = apps.get_model('recruitment', 'Poste')
+    through = Poste.competences.through
+    links = {
+        poste_id: parse_skills(raw)
+        for poste_id, raw in Poste.objects.values_list('id', 'competences_requises')
+    }
+    names = {name[:100] for skills in links.values() for name in skills}
+    Competence.objects.bulk_create([Competence(nom=name) for name in names], ignore_conflicts=True)
+    ids = dict(Competence.objects.values_list('nom', 'id'))
+    through.objects.bulk_create(
+        [
+            through(poste_id=poste_id, competence_id=ids[name[:100]])
+            for poste_id, skills in links.items()
+            for name in skills
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0007_poste_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Competence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nom', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['nom'],
+            },
+        ),
+        migrations.AddField(
+            model_name='poste',
+            name='competences',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='postes', to='recruitment.competence'),
+        ),
+        migrations.RunPython(index_existing_postes, migrations.RunPython.noop),
+    ]
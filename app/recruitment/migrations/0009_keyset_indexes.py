@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0008_competence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidature',
+            index=models.Index(fields=['date_soumission', 'id'], name='recruitment_date_so_bf2d2e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='score',
+            index=models.Index(fields=['date_analyse', 'id'], name='recruitment_date_an_3a5450_idx'),
+        ),
+    ]
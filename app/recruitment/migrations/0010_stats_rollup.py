@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_stats(apps, schema_editor):
+    Candidature = apps.get_model('recruitment', 'Candidature')
+    PosteStatutStat = apps.get_model('recruitment', 'PosteStatutStat')
+    SoumissionJournaliere = apps.get_model('recruitment', 'SoumissionJournaliere')
+    PosteStatutStat.objects.bulk_create(
+        PosteStatutStat(**row)
+        for row in Candidature.objects.order_by().values('poste_id', 'statut').annotate(total=Count('id'))
+    )
+    SoumissionJournaliere.objects.bulk_create(
+        SoumissionJournaliere(**row)
+        for row in Candidature.objects.order_by()
+        .annotate(jour=TruncDate('date_soumission'))
+        .values('poste_id', 'jour')
+        .annotate(total=Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0009_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PosteStatutStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('statut', models.CharField(choices=[('submitted', 'Soumise'), ('in_review', 'En revue'), ('interview', 'Entretien'), ('accepted', 'Acceptée'), ('rejected', 'Refusée')], max_length=20)),
+                ('total', models.IntegerField(default=0)),
+                ('poste', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats_statut', to='recruitment.poste')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('poste', 'statut'), name='unique_stat_poste_statut')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SoumissionJournaliere',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jour', models.DateField()),
+                ('total', models.IntegerField(default=0)),
+                ('poste', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats_journalieres', to='recruitment.poste')),
+            ],
+            options={
+                'ordering': ['-jour'],
+                'indexes': [models.Index(fields=['jour'], name='recruitment_jour_fcd568_idx')],
+                'constraints': [models.UniqueConstraint(fields=('poste', 'jour'), name='unique_stat_poste_jour')],
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
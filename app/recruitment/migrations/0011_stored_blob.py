@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:53
+
+import recruitment.storage
+import recruitment.utils
+import recruitment.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0010_stats_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('taille', models.BigIntegerField()),
+                ('references', models.IntegerField(default=0)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='candidature',
+            name='cv_file',
+            field=models.FileField(blank=True, null=True, storage=recruitment.storage.document_storage, upload_to=recruitment.utils.upload_to_cv, validators=[recruitment.validators.DocumentUploadValidator()]),
+        ),
+        migrations.AlterField(
+            model_name='candidature',
+            name='lettre_motivation_file',
+            field=models.FileField(blank=True, null=True, storage=recruitment.storage.document_storage, upload_to=recruitment.utils.upload_to_lettre, validators=[recruitment.validators.DocumentUploadValidator()]),
+        ),
+    ]
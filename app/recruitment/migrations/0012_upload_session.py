@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-17 01:58
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0011_stored_blob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('champ', models.CharField(choices=[('cv_file', 'CV'), ('lettre_motivation_file', 'Lettre de motivation')], max_length=30)),
+                ('nom_fichier', models.CharField(max_length=255)),
+                ('taille', models.PositiveIntegerField()),
+                ('taille_morceau', models.PositiveIntegerField()),
+                ('octets_recus', models.PositiveIntegerField(default=0)),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_fin', models.DateTimeField(blank=True, null=True)),
+                ('candidature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='recruitment.candidature')),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('recruitment', '0013_notification_inbox_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastReadMarker',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='broadcast_marker', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_read_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BroadcastNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('audience', models.CharField(choices=[('recruitment', 'Recruteurs et administrateurs'), ('administration', 'Administrateurs')], max_length=20)),
+                ('notification_type', models.CharField(choices=[('new_candidature', 'Nouvelle candidature'), ('status_update', 'Changement de statut'), ('new_post', 'Nouveau poste créé')], max_length=50)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['audience', 'created_at', 'id'], name='recruitment_audienc_c0e371_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0015_notification_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastNotificationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('audience', models.CharField(choices=[('recruitment', 'Recruteurs et administrateurs'), ('administration', 'Administrateurs')], max_length=20)),
+                ('notification_type', models.CharField(choices=[('new_candidature', 'Nouvelle candidature'), ('status_update', 'Changement de statut'), ('new_post', 'Nouveau poste créé')], max_length=50)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
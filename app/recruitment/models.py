@@ -1,9 +1,24 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
+from .storage import document_storage
 from .validators import validate_document_file
 from .utils import upload_to_cv, upload_to_lettre
 
 
+class Competence(models.Model):
+    """Compétence normalisée (minuscules, sans accents), extraite de ``Poste.competences_requises``."""
+
+    nom = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ["nom"]
+
+    def __str__(self) -> str:
+        return self.nom
+
+
 class Poste(models.Model):
     class TypeContrat(models.TextChoices):
         CDI = "CDI", "CDI"
@@ -13,6 +28,8 @@ class Poste(models.Model):
     titre = models.CharField(max_length=200)
     description = models.TextField()
     competences_requises = models.TextField(blank=True)
+    # Index inversé compétence -> postes, maintenu par recruitment.skills à l'enregistrement
+    competences = models.ManyToManyField(Competence, related_name="postes", blank=True, editable=False)
     type_contrat = models.CharField(max_length=20, choices=TypeContrat.choices, default=TypeContrat.CDI)
     date_creation = models.DateTimeField(auto_now_add=True)
     actif = models.BooleanField(default=True)
@@ -39,12 +56,14 @@ class Candidature(models.Model):
     poste = models.ForeignKey(Poste, on_delete=models.CASCADE, related_name="candidatures")
     cv_file = models.FileField(
         upload_to=upload_to_cv,
+        storage=document_storage,
         validators=[validate_document_file],
         blank=True,
         null=True,
     )
     lettre_motivation_file = models.FileField(
         upload_to=upload_to_lettre,
+        storage=document_storage,
         validators=[validate_document_file],
         blank=True,
         null=True,
@@ -56,14 +75,85 @@ class Candidature(models.Model):
         ordering = ["-date_soumission"]
         indexes = [
             models.Index(fields=["statut", "date_soumission"]),
+            # Clé de la pagination par curseur de l'API
+            models.Index(fields=["date_soumission", "id"]),
         ]
         constraints = [
             models.UniqueConstraint(fields=["candidat", "poste"], name="unique_candidature_par_poste"),
         ]
 
+    DOCUMENT_FIELDS = ("cv_file", "lettre_motivation_file")
+
+    # Statut tel que lu en base ou dernièrement enregistré (None : inconnu, ex. champ différé)
+    _loaded_statut = None
+    # Poste tel que lu en base ou dernièrement enregistré
+    _loaded_poste_id = None
+    # Noms des documents lus en base ou dernièrement enregistrés, par champ
+    _loaded_documents = {}
+
     def __str__(self) -> str:
         return f"{self.candidat.username} -> {self.poste.titre} ({self.get_statut_display()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_statut = instance.__dict__.get('statut')
+        instance._loaded_poste_id = instance.__dict__.get('poste_id')
+        instance._loaded_documents = instance._document_names()
+        return instance
+
+    def _document_names(self):
+        # Champs différés ignorés : pas de requête
+        return {
+            field: getattr(self, field).name
+            for field in self.DOCUMENT_FIELDS
+            if field in self.__dict__ and getattr(self, field)
+        }
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or 'statut' in fields:
+            self._loaded_statut = self.__dict__.get('statut')
+        if fields is None or 'poste' in fields or 'poste_id' in fields:
+            self._loaded_poste_id = self.__dict__.get('poste_id')
+        self._loaded_documents = self._document_names()
+
+    @property
+    def statut_change(self):
+        """(ancien, nouveau) si ``statut`` diffère de la valeur chargée, sans requête ; sinon None."""
+        if self._loaded_statut is not None and self._loaded_statut != self.statut:
+            return self._loaded_statut, self.statut
+        return None
+
+    @property
+    def poste_change(self):
+        """(ancien poste_id, nouveau poste_id) si le poste diffère de la valeur chargée ; sinon None."""
+        if self._loaded_poste_id is not None and self._loaded_poste_id != self.poste_id:
+            return self._loaded_poste_id, self.poste_id
+        return None
+
+    @property
+    def replaced_documents(self):
+        """Noms des documents remplacés ou retirés depuis le chargement (à libérer), sans requête."""
+        current = self._document_names()
+        return [name for field, name in self._loaded_documents.items() if current.get(field) != name]
+
+    def save(self, *args, **kwargs):
+        # Les receveurs de post_save voient encore l'ancien statut via ``statut_change``
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'statut' in update_fields:
+            self._loaded_statut = self.statut
+        if update_fields is None or {'poste', 'poste_id'} & set(update_fields):
+            self._loaded_poste_id = self.poste_id
+        documents, current = dict(self._loaded_documents), self._document_names()
+        for field in self.DOCUMENT_FIELDS:
+            if update_fields is None or field in update_fields:
+                documents.pop(field, None)
+                if field in current:
+                    documents[field] = current[field]
+        self._loaded_documents = documents
+
     def get_statut_class(self) -> str:
         if self.statut == self.Statuts.SOUMISE:
             return "bg-gray-100 text-gray-800"
@@ -86,6 +176,9 @@ class Score(models.Model):
 
     class Meta:
         ordering = ["-date_analyse"]
+        indexes = [
+            models.Index(fields=["date_analyse", "id"]),
+        ]
 
     def __str__(self) -> str:
         return f"Score {self.score_ia if self.score_ia is not None else '-'} pour {self.candidature}"
@@ -107,7 +200,157 @@ class Notification(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "is_read"]),
+            # Boîte de réception paginée par curseur (created_at, id)
+            models.Index(fields=["user", "created_at", "id"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Notification pour {self.user.username} ({self.get_notification_type_display()})"
+
+
+class NotificationArchive(models.Model):
+    """Notification lue, sortie de la table active après le délai de rétention (voir recruitment.retention)."""
+
+    # Identifiant d'origine : un lot rejoué après une interruption n'archive rien en double
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_notifications")
+    notification_type = models.CharField(max_length=50, choices=Notification.NotificationType.choices)
+    message = models.TextField()
+    created_at = models.DateTimeField(db_index=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Archive {self.pk} ({self.get_notification_type_display()})"
+
+
+class BroadcastNotification(models.Model):
+    """Notification destinée à une audience (rôles) : une seule ligne par événement, quel que soit le nombre de destinataires."""
+
+    class Audience(models.TextChoices):
+        RECRUTEMENT = "recruitment", "Recruteurs et administrateurs"
+        ADMINISTRATION = "administration", "Administrateurs"
+
+    audience = models.CharField(max_length=20, choices=Audience.choices)
+    notification_type = models.CharField(max_length=50, choices=Notification.NotificationType.choices)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["audience", "created_at", "id"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Diffusion {self.get_audience_display()} ({self.get_notification_type_display()})"
+
+
+class BroadcastNotificationArchive(models.Model):
+    """Diffusion lue par toute son audience, sortie de la table active (voir recruitment.retention)."""
+
+    id = models.BigIntegerField(primary_key=True)
+    audience = models.CharField(max_length=20, choices=BroadcastNotification.Audience.choices)
+    notification_type = models.CharField(max_length=50, choices=Notification.NotificationType.choices)
+    message = models.TextField()
+    created_at = models.DateTimeField(db_index=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Archive diffusion {self.pk} ({self.get_notification_type_display()})"
+
+
+class BroadcastReadMarker(models.Model):
+    """Repère de lecture des diffusions : celles d'``id`` inférieur ou égal à ``last_read_id`` sont lues."""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="broadcast_marker")
+    last_read_id = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.user_id} : {self.last_read_id}"
+
+class DocumentText(models.Model):
+    """Texte extrait d'un document, indexé par le SHA-256 de son contenu (un même CV n'est lu qu'une fois)."""
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    taille = models.BigIntegerField()
+    texte = models.TextField(blank=True)
+    date_extraction = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.sha256[:12]} ({self.taille} o)"
+
+
+class PosteStatutStat(models.Model):
+    """Nombre de candidatures par (poste, statut), tenu à jour incrémentalement (voir recruitment.stats)."""
+
+    poste = models.ForeignKey(Poste, on_delete=models.CASCADE, related_name="stats_statut")
+    statut = models.CharField(max_length=20, choices=Candidature.Statuts.choices)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["poste", "statut"], name="unique_stat_poste_statut"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.poste_id} / {self.statut} : {self.total}"
+
+
+class SoumissionJournaliere(models.Model):
+    """Nombre de candidatures soumises par poste et par jour (candidatures existantes)."""
+
+    poste = models.ForeignKey(Poste, on_delete=models.CASCADE, related_name="stats_journalieres")
+    jour = models.DateField()
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-jour"]
+        constraints = [
+            models.UniqueConstraint(fields=["poste", "jour"], name="unique_stat_poste_jour"),
+        ]
+        indexes = [
+            models.Index(fields=["jour"]),
         ]
 
     def __str__(self) -> str:
-        return f"Notification pour {self.user.username} ({self.get_notification_type_display()})"
\ No newline at end of file
+        return f"{self.poste_id} / {self.jour} : {self.total}"
+
+
+class StoredBlob(models.Model):
+    """Contenu de document stocké une seule fois (voir recruitment.storage) et nombre de noms qui y renvoient."""
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    taille = models.BigIntegerField()
+    references = models.IntegerField(default=0)
+    date_creation = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.sha256[:12]} ({self.references} réf.)"
+
+
+class UploadSession(models.Model):
+    """Envoi d'un document en morceaux numérotés, reprenable (voir recruitment.chunked_uploads)."""
+
+    class Champs(models.TextChoices):
+        CV = "cv_file", "CV"
+        LETTRE = "lettre_motivation_file", "Lettre de motivation"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    candidature = models.ForeignKey(Candidature, on_delete=models.CASCADE, related_name="upload_sessions")
+    champ = models.CharField(max_length=30, choices=Champs.choices)
+    nom_fichier = models.CharField(max_length=255)
+    taille = models.PositiveIntegerField()
+    taille_morceau = models.PositiveIntegerField()
+    # Octets reçus et confirmés : point de reprise
+    octets_recus = models.PositiveIntegerField(default=0)
+    date_creation = models.DateTimeField(auto_now_add=True)
+    date_fin = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.nom_fichier} ({self.octets_recus}/{self.taille} o)"
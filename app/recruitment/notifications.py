@@ -0,0 +1,142 @@
+"""Compteur de notifications non lues par utilisateur, tenu en cache.
+
+Le compteur est calculé (``COUNT(*)``) une fois, puis incrémenté à chaque notification créée et
+décrémenté à chaque lecture, après validation de la transaction : les clients qui interrogent
+``unread-count`` en boucle ne touchent pas la base. ``NOTIFICATIONS_UNREAD_CACHE_TIMEOUT`` borne
+l'écart possible (course entre un premier calcul et une insertion concurrente). En production
+avec plusieurs processus, ``CACHES`` doit désigner un cache partagé (Redis, Memcached).
+
+Les diffusions (``BroadcastNotification``) sont stockées une fois par événement pour une audience ;
+leur état de lecture est un repère par utilisateur (``BroadcastReadMarker.last_read_id``) : marquer
+une diffusion comme lue marque aussi les précédentes. Un utilisateur ne voit que les diffusions de
+ses audiences créées après son inscription.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, QuerySet
+
+from accounts.models import UserProfile
+from accounts.permissions import get_user_roles
+from .models import BroadcastNotification, BroadcastReadMarker, Notification
+
+DEFAULT_TIMEOUT = 300
+
+# Audience -> (rôles, personnel inclus), comme ``services.resolve_recipients``
+AUDIENCES: Dict[str, Tuple[Sequence[str], bool]] = {
+    BroadcastNotification.Audience.RECRUTEMENT: ([UserProfile.Roles.ADMIN, UserProfile.Roles.RECRUITER], False),
+    BroadcastNotification.Audience.ADMINISTRATION: ([UserProfile.Roles.ADMIN], True),
+}
+
+
+def _cache_key(user_id: int) -> str:
+    return f'recruitment:notifications:unread:{user_id}'
+
+
+def _timeout() -> int:
+    return getattr(settings, 'NOTIFICATIONS_UNREAD_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def audiences_for(user) -> List[str]:
+    role = get_user_roles(user).role
+    return [
+        audience for audience, (roles, include_staff) in AUDIENCES.items()
+        if role in roles or (include_staff and user.is_staff)
+    ]
+
+
+def visible_broadcasts(user) -> QuerySet:
+    return BroadcastNotification.objects.filter(audience__in=audiences_for(user), created_at__gte=user.date_joined)
+
+
+def last_read_broadcast(user_id: int) -> int:
+    marker = BroadcastReadMarker.objects.filter(user_id=user_id).values_list('last_read_id', flat=True).first()
+    return marker or 0
+
+
+def unread_count(user) -> int:
+    count = cache.get(_cache_key(user.pk))
+    if count is None:
+        count = (
+            Notification.objects.filter(user_id=user.pk, is_read=False).count()
+            + visible_broadcasts(user).filter(pk__gt=last_read_broadcast(user.pk)).count()
+        )
+        # ``add`` : ne remplace pas une valeur posée entre-temps par un autre processus
+        cache.add(_cache_key(user.pk), count, _timeout())
+    return max(count, 0)
+
+
+def _apply_deltas(deltas: Mapping[int, int]) -> None:
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(_cache_key(user_id), delta)
+        except ValueError:
+            # Compteur absent ou expiré : il sera recalculé à la prochaine lecture
+            pass
+
+
+def record_new_notifications(user_ids: Iterable[int]) -> None:
+    """Une notification non lue de plus par occurrence de ``user_id`` (après validation)."""
+    deltas = Counter(user_ids)
+    transaction.on_commit(lambda: _apply_deltas(deltas))
+
+
+def invalidate(user_id: int) -> None:
+    cache.delete(_cache_key(user_id))
+
+
+def mark_read(user, ids: Optional[Iterable[int]] = None, broadcast_ids: Optional[Iterable[int]] = None) -> int:
+    """Marque comme lues les notifications (``ids``, un seul UPDATE) et les diffusions (``broadcast_ids``).
+
+    Sans ``ids`` ni ``broadcast_ids`` : tout ce qui est non lu.
+    """
+    everything = ids is None and broadcast_ids is None
+    updated = 0
+    if everything or ids is not None:
+        queryset = Notification.objects.filter(user_id=user.pk, is_read=False)
+        if ids is not None:
+            queryset = queryset.filter(pk__in=list(ids))
+        updated = queryset.update(is_read=True)
+    if everything:
+        updated += advance_broadcast_marker(user)
+    elif broadcast_ids:
+        updated += advance_broadcast_marker(user, max(broadcast_ids))
+    if updated:
+        transaction.on_commit(lambda: _apply_deltas({user.pk: -updated}))
+    return updated
+
+
+def advance_broadcast_marker(user, up_to: Optional[int] = None) -> int:
+    """Avance le repère de lecture jusqu'à la diffusion ``up_to`` (la dernière si None).
+
+    Retourne le nombre de diffusions nouvellement lues ; le repère ne recule jamais.
+    """
+    with transaction.atomic():
+        marker, _ = BroadcastReadMarker.objects.select_for_update().get_or_create(user_id=user.pk)
+        broadcasts = visible_broadcasts(user).filter(pk__gt=marker.last_read_id)
+        if up_to is not None:
+            broadcasts = broadcasts.filter(pk__lte=up_to)
+        newly_read = broadcasts.aggregate(count=Count('pk'), last=Max('pk'))
+        if newly_read['count']:
+            marker.last_read_id = newly_read['last']
+            marker.save(update_fields=['last_read_id'])
+    return newly_read['count']
+
+
+def mark_queryset_read(queryset: QuerySet) -> int:
+    """Variante multi-utilisateurs (admin) : compteurs ajustés par utilisateur."""
+    queryset = queryset.filter(is_read=False)
+    deltas = {
+        user_id: -count
+        for user_id, count in queryset.order_by().values_list('user_id').annotate(n=Count('id'))
+    }
+    updated = queryset.update(is_read=True)
+    transaction.on_commit(lambda: _apply_deltas(deltas))
+    return updated
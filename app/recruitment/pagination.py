@@ -0,0 +1,226 @@
+"""Pagination par curseur (keyset) pour les listes volumineuses de l'API.
+
+Chaque page est une requête ``WHERE (clé) > (dernière clé vue) ORDER BY clé LIMIT n`` :
+pas d'``OFFSET``, coût constant quelle que soit la profondeur. La clé est l'ordre demandé
+(paramètre ``ordering``) complété par l'``id``, ce qui la rend unique donc stable.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework import filters
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """Réponse ``{count, next, previous, results}`` ; ``?count=false`` évite le ``COUNT(*)``."""
+
+    ordering = '-pk'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = "Curseur invalide."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.keys = self.get_ordering(request, queryset, view)
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if self.with_count(request) else None
+
+        position, reverse = self.decode_cursor(request)
+        keys = [self.invert(key) for key in self.keys] if reverse else self.keys
+        queryset = queryset.order_by(*keys)
+        if position is not None:
+            queryset = queryset.filter(self.after(keys, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    # --- Ordre et clés ---
+
+    def get_ordering(self, request, queryset, view) -> List[str]:
+        """Ordre de ``OrderingFilter`` s'il est utilisé par la vue, sinon ``ordering``, plus l'``id``."""
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, filters.OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        keys = ['-pk' if key == '-id' else 'pk' if key == 'id' else key for key in (ordering or [self.ordering])]
+        if not any(key.lstrip('-') == 'pk' for key in keys):
+            keys.append('-pk' if keys[-1].startswith('-') else 'pk')
+        return keys
+
+    @staticmethod
+    def invert(key: str) -> str:
+        return key[1:] if key.startswith('-') else f'-{key}'
+
+    def field(self, key: str):
+        name = key.lstrip('-')
+        return self.model._meta.pk if name == 'pk' else self.model._meta.get_field(name)
+
+    def after(self, keys: List[str], position: List) -> Q:
+        """Lignes strictement après ``position`` dans l'ordre ``keys`` (comparaison lexicographique)."""
+        condition = Q()
+        equal = Q()
+        for key, value in zip(keys, position):
+            name = key.lstrip('-')
+            lookup = 'lt' if key.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    # --- Curseurs ---
+
+    def encode_cursor(self, row, reverse: bool) -> str:
+        values = self.cursor_values(row)
+        payload = json.dumps({'o': self.keys, 'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> Tuple[Optional[List], bool]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            if payload['o'] != self.keys or len(payload['v']) != len(self.keys):
+                raise ValueError
+            return self.parse_position(payload['v']), bool(payload['r'])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def cursor_values(self, row) -> List[str]:
+        return [self.field(key).value_to_string(row) for key in self.keys]
+
+    def parse_position(self, values: List) -> List:
+        return [self.field(key).to_python(value) for key, value in zip(self.keys, values)]
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    # --- Paramètres ---
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def with_count(self, request) -> bool:
+        return request.query_params.get(self.count_query_param, 'true').lower() not in ('0', 'false', 'no')
+
+
+class CandidatureCursorPagination(KeysetCursorPagination):
+    ordering = '-date_soumission'
+
+
+class ScoreCursorPagination(KeysetCursorPagination):
+    ordering = '-date_analyse'
+
+
+class InboxCursorPagination(KeysetCursorPagination):
+    """Fusionne plusieurs flux (notifications personnelles, diffusions), les plus récents d'abord.
+
+    La clé est (created_at, source, id). Chaque page lit au plus ``page_size + 1`` lignes par flux,
+    par son index (…, created_at, id), puis les fusionne en mémoire : le coût ne dépend ni de la
+    profondeur ni de la taille des flux.
+    """
+
+    keys = ['-created_at', '-source', '-pk']
+
+    def paginate_sources(self, sources: Dict[str, QuerySet], request, view=None) -> List:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = sum(queryset.count() for queryset in sources.values()) if self.with_count(request) else None
+
+        position, reverse = self.decode_cursor(request)
+        rows = []
+        for source, queryset in sources.items():
+            queryset = queryset.order_by(*(('created_at', 'pk') if reverse else ('-created_at', '-pk')))
+            if position is not None:
+                queryset = queryset.filter(self.after_in_source(source, position, reverse))
+            for row in queryset[:self.page_size + 1]:
+                row.source = source
+                rows.append(row)
+        rows.sort(key=lambda row: (row.created_at, row.source, row.pk), reverse=not reverse)
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+        self.page = rows
+        return rows
+
+    @staticmethod
+    def after_in_source(source: str, position: List, reverse: bool) -> Q:
+        """Lignes du flux ``source`` strictement après ``position`` (avant si ``reverse``)."""
+        created_at, position_source, pk = position
+        lookup = 'gt' if reverse else 'lt'
+        condition = Q(**{f'created_at__{lookup}': created_at})
+        if source == position_source:
+            condition |= Q(created_at=created_at, **{f'pk__{lookup}': pk})
+        elif (source > position_source) == reverse:
+            # Même instant, autre flux : la source départage
+            condition |= Q(created_at=created_at)
+        return condition
+
+    def cursor_values(self, row) -> List[str]:
+        return [row.created_at.isoformat(), row.source, str(row.pk)]
+
+    def parse_position(self, values: List) -> List:
+        created_at = parse_datetime(values[0])
+        if created_at is None:
+            raise ValueError
+        return [created_at, str(values[1]), int(values[2])]
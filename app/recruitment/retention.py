@@ -0,0 +1,167 @@
+"""Rétention des notifications : les notifications lues anciennes quittent la table active.
+
+Les notifications lues créées il y a plus de ``NOTIFICATIONS_RETENTION_DAYS`` jours sont copiées
+dans ``NotificationArchive`` puis supprimées de ``Notification``, par lots parcourus dans l'ordre
+des ``id`` (donc chronologique). Chaque lot est une transaction courte : les écritures concurrentes
+ne sont bloquées que le temps d'un lot, jamais celui de toute l'archive. Une notification non lue
+n'est jamais archivée ; les compteurs de non lues ne changent donc pas.
+
+Les diffusions (``BroadcastNotification``) du même âge passent dans ``BroadcastNotificationArchive``
+une fois lues par tous leurs destinataires, c'est-à-dire d'``id`` au plus égal au repère de lecture
+de chaque membre de l'audience inscrit avant elles : elles sont déjà comptées comme lues partout.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import BroadcastNotification, BroadcastNotificationArchive, Notification, NotificationArchive
+from .notifications import AUDIENCES
+from .services import recipients_queryset
+
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_BATCH_SIZE = 1000
+
+
+def retention_cutoff(days: Optional[int] = None) -> datetime:
+    if days is None:
+        days = getattr(settings, 'NOTIFICATIONS_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    return timezone.now() - timedelta(days=days)
+
+
+def archive_batch(cutoff: datetime, after_id: int = 0, batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[int, int]:
+    """Archive un lot de notifications lues antérieures à ``cutoff`` et d'``id`` > ``after_id``.
+
+    Retourne (nombre archivé, dernier id examiné) ; 0 archivé : plus rien à faire.
+    """
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.filter(pk__gt=after_id, is_read=True, created_at__lt=cutoff)
+            .select_for_update()
+            .order_by('pk')
+            .values_list('id', 'user_id', 'notification_type', 'message', 'created_at')[:batch_size]
+        )
+        if not rows:
+            return 0, after_id
+        NotificationArchive.objects.bulk_create(
+            [
+                NotificationArchive(id=pk, user_id=user_id, notification_type=type_, message=message, created_at=created_at)
+                for pk, user_id, type_, message, created_at in rows
+            ],
+            ignore_conflicts=True,
+        )
+        # Un seul DELETE, sans charger les lignes ni émettre post_delete ligne par ligne : elles sont
+        # lues (et verrouillées), les compteurs de non lues n'ont rien à ajuster
+        delete_notifications([row[0] for row in rows])
+    return len(rows), rows[-1][0]
+
+
+def delete_notifications(ids: Sequence[int]) -> None:
+    """``DELETE ... WHERE id IN (...)`` en SQL direct : ni chargement des lignes ni signaux."""
+    table = connection.ops.quote_name(Notification._meta.db_table)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", list(ids))
+
+
+def archive_notifications(
+        days: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[int]:
+    """Archive lot par lot ; produit le nombre de notifications archivées par lot."""
+    cutoff = retention_cutoff(days)
+    last_id = 0
+    while True:
+        archived, last_id = archive_batch(cutoff, last_id, batch_size)
+        if not archived:
+            return
+        yield archived
+        if archived < batch_size:
+            return
+
+
+def read_broadcast_bound(audience: str, cutoff: datetime) -> int:
+    """Plus grand ``id`` de diffusion de ``audience`` antérieure à ``cutoff`` lue par tous ses destinataires.
+
+    Une diffusion n'est visible que des membres inscrits avant elle : en parcourant les diffusions
+    dans l'ordre, les destinataires ne font que s'ajouter et le plus petit repère ne fait que baisser.
+    Les diffusions archivables forment donc un préfixe ; 0 : aucune.
+    """
+    members = iter(
+        recipients_queryset(*AUDIENCES[audience])
+        .annotate(last_read=Coalesce('broadcast_marker__last_read_id', 0))
+        .order_by('date_joined')
+        .values_list('date_joined', 'last_read')
+    )
+    member = next(members, None)
+    lowest = None
+    bound = 0
+    broadcasts = (
+        BroadcastNotification.objects.filter(audience=audience, created_at__lt=cutoff)
+        .order_by('pk').values_list('pk', 'created_at')
+    )
+    for pk, created_at in broadcasts.iterator():
+        while member is not None and member[0] <= created_at:
+            lowest = member[1] if lowest is None else min(lowest, member[1])
+            member = next(members, None)
+        if lowest is not None and pk > lowest:
+            break
+        bound = pk
+    return bound
+
+
+def archive_broadcast_batch(
+        cutoff: datetime, bounds: Mapping[str, int], after_id: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[int, int]:
+    """Archive un lot de diffusions antérieures à ``cutoff`` d'``id`` au plus ``bounds[audience]``.
+
+    Retourne (nombre archivé, dernier id examiné), comme ``archive_batch``.
+    """
+    condition = Q()
+    for audience, bound in bounds.items():
+        if bound:
+            condition |= Q(audience=audience, pk__lte=bound)
+    if not condition:
+        return 0, after_id
+    with transaction.atomic():
+        rows = list(
+            BroadcastNotification.objects.filter(condition, pk__gt=after_id, created_at__lt=cutoff)
+            .order_by('pk')
+            .values_list('id', 'audience', 'notification_type', 'message', 'created_at')[:batch_size]
+        )
+        if not rows:
+            return 0, after_id
+        BroadcastNotificationArchive.objects.bulk_create(
+            [
+                BroadcastNotificationArchive(
+                    id=pk, audience=audience, notification_type=type_, message=message, created_at=created_at,
+                )
+                for pk, audience, type_, message, created_at in rows
+            ],
+            ignore_conflicts=True,
+        )
+        # Lues par tous leurs destinataires : aucun compteur de non lues à ajuster
+        BroadcastNotification.objects.filter(pk__in=[row[0] for row in rows]).delete()
+    return len(rows), rows[-1][0]
+
+
+def archive_broadcasts(
+        days: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[int]:
+    """Archive lot par lot les diffusions lues par toute leur audience ; produit le nombre archivé par lot."""
+    cutoff = retention_cutoff(days)
+    # Repères calculés une fois : ils ne reculent jamais, une borne ne devient pas fausse en cours de route
+    bounds: Dict[str, int] = {audience: read_broadcast_bound(audience, cutoff) for audience in AUDIENCES}
+    last_id = 0
+    while True:
+        archived, last_id = archive_broadcast_batch(cutoff, bounds, last_id, batch_size)
+        if not archived:
+            return
+        yield archived
+        if archived < batch_size:
+            return
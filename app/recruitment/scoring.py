@@ -0,0 +1,152 @@
+"""Moteur de scoring CV ↔ poste par pondération TF-IDF (vecteurs creux).
+
+Ce module ne dépend pas de Django : ``score_batch`` tourne dans les processus du pool.
+L'IDF est calculé sur le corpus des postes : le cosinus ne dépend que des termes partagés,
+donc les termes absents des postes n'ont pas besoin d'être pondérés.
+"""
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+SparseVector = Dict[str, float]
+
+# Pondération finale : similarité globale du texte et couverture des compétences requises
+TEXT_WEIGHT = 0.6
+SKILLS_WEIGHT = 0.4
+SKILLS_BOOST = 2.0
+TOP_TERMS = 5
+
+STOP_WORDS = frozenset("""
+    a au aux avec ce ces dans de des du elle en et eux il je la le les leur lui ma mais me meme mes moi mon ne nos
+    notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton tu un une vos votre vous y
+    an and are as at be by for from has in is it of on or that the to was were will with
+""".split())
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+_SKILL_SPLIT_RE = re.compile(r'[,;\n/|•·]+|\s+-\s+|\bet\b|\band\b')
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    # 'c' et 'r' sont des langages : seules exceptions à la longueur minimale
+    return [t for t in _TOKEN_RE.findall(normalize(text)) if (len(t) > 1 or t in ('c', 'r')) and t not in STOP_WORDS]
+
+
+def parse_skills(raw: str) -> List[str]:
+    """Découpe le champ libre ``competences_requises`` en compétences normalisées (sans doublons)."""
+    skills = []
+    for part in _SKILL_SPLIT_RE.split(normalize(raw)):
+        skill = ' '.join(tokenize(part))
+        if skill and skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def compute_idf(documents: Iterable[Sequence[str]]) -> Dict[str, float]:
+    df: Counter = Counter()
+    n = 0
+    for tokens in documents:
+        n += 1
+        df.update(set(tokens))
+    return {term: math.log((1 + n) / (1 + count)) + 1.0 for term, count in df.items()}
+
+
+def tfidf(tokens: Sequence[str], idf: Mapping[str, float], boost: Optional[Mapping[str, float]] = None) -> SparseVector:
+    vector = {}
+    for term, count in Counter(tokens).items():
+        weight = idf.get(term)
+        if weight is None:
+            continue
+        vector[term] = (1.0 + math.log(count)) * weight * (boost.get(term, 1.0) if boost else 1.0)
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {term: w / norm for term, w in vector.items()} if norm else {}
+
+
+def cosine(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(term, 0.0) for term, w in a.items())
+
+
+class PosteProfile:
+    """Vecteur TF-IDF d'un poste et ses compétences requises, calculés une fois par exécution."""
+
+    __slots__ = ('poste_id', 'vector', 'skills')
+
+    def __init__(self, poste_id: int, vector: SparseVector, skills: List[Tuple[str, frozenset]]):
+        self.poste_id = poste_id
+        self.vector = vector
+        self.skills = skills
+
+
+def build_poste_profiles(postes: Iterable[Mapping]) -> Tuple[Dict[int, PosteProfile], Dict[str, float]]:
+    """``postes`` : dicts avec ``id``, ``description`` et ``competences_requises``."""
+    postes = list(postes)
+    documents = {p['id']: tokenize(f"{p['description']}\n{p['competences_requises']}") for p in postes}
+    idf = compute_idf(documents.values())
+
+    profiles = {}
+    for poste in postes:
+        skills = [(skill, frozenset(skill.split())) for skill in parse_skills(poste['competences_requises'])]
+        boost = {term: SKILLS_BOOST for _, terms in skills for term in terms}
+        profiles[poste['id']] = PosteProfile(poste['id'], tfidf(documents[poste['id']], idf, boost), skills)
+    return profiles, idf
+
+
+def score_text(text: str, profile: PosteProfile, idf: Mapping[str, float]) -> Tuple[float, str]:
+    tokens = tokenize(text)
+    cv_vector = tfidf(tokens, idf)
+    similarity = cosine(cv_vector, profile.vector)
+
+    token_set = set(tokens)
+    present = [skill for skill, terms in profile.skills if terms <= token_set]
+    missing = [skill for skill, terms in profile.skills if not terms <= token_set]
+    coverage = len(present) / len(profile.skills) if profile.skills else similarity
+
+    score = round(100 * (TEXT_WEIGHT * similarity + SKILLS_WEIGHT * coverage), 2)
+    top_terms = sorted(
+        (term for term in cv_vector if term in profile.vector),
+        key=lambda term: cv_vector[term] * profile.vector[term],
+        reverse=True,
+    )[:TOP_TERMS]
+
+    lines = [
+        f"Compétences présentes : {', '.join(present) or 'aucune'}.",
+        f"Compétences manquantes : {', '.join(missing) or 'aucune'}.",
+    ]
+    if top_terms:
+        lines.append(f"Termes les plus proches du poste : {', '.join(top_terms)}.")
+    return score, '\n'.join(lines)
+
+
+# --- Exécution dans les processus du pool ---
+
+_worker_state: Dict[str, object] = {}
+
+
+def init_worker(profiles: Dict[int, PosteProfile], idf: Dict[str, float]) -> None:
+    """Reçoit une seule fois les vecteurs des postes par processus."""
+    _worker_state['profiles'] = profiles
+    _worker_state['idf'] = idf
+
+
+def score_batch(items: Sequence[Tuple[int, int, str]]) -> List[Tuple[int, float, str]]:
+    """``items`` : (candidature_id, poste_id, texte des documents). Retourne (id, score, recommandation)."""
+    profiles = _worker_state['profiles']
+    idf = _worker_state['idf']
+    results = []
+    for candidature_id, poste_id, text in items:
+        profile = profiles.get(poste_id)
+        if profile is None:
+            continue
+        score, recommandation = score_text(text, profile, idf)
+        results.append((candidature_id, score, recommandation))
+    return results
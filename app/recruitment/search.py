@@ -0,0 +1,70 @@
+"""Recherche plein texte des postes : index SQLite FTS5 classé par bm25.
+
+L'index ``recruitment_poste_fts`` (table FTS5 à contenu externe) est tenu à jour par des
+triggers SQL (migration 0007) : les ``QuerySet.update()`` et ``bulk_create`` sont couverts,
+contrairement aux signaux. Les accents sont ignorés (``remove_diacritics``) à l'indexation
+comme à la requête. Sur un autre moteur de base, repli sur ``icontains``.
+"""
+from __future__ import annotations
+
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+FTS_TABLE = 'recruitment_poste_fts'
+# Poids bm25 des colonnes indexées : titre, description, competences_requises
+COLUMN_WEIGHTS = (10.0, 1.0, 5.0)
+SEARCH_FIELDS = ('titre', 'description', 'competences_requises')
+
+_TERM_RE = re.compile(r'\w+')
+
+
+def fts_query(text: str) -> str:
+    """Requête MATCH sûre : chaque mot est cité (pas d'opérateur FTS5 injecté) et recherché en préfixe."""
+    return ' '.join(f'"{term}"*' for term in _TERM_RE.findall(text or ''))
+
+
+def search_postes(queryset: QuerySet, text: str) -> QuerySet:
+    """Filtre ``queryset`` (de ``Poste``) sur ``text``, du plus pertinent au moins pertinent."""
+    query = fts_query(text)
+    if not query:
+        return queryset
+    if connection.vendor != 'sqlite':
+        condition = Q()
+        for term in _TERM_RE.findall(text):
+            condition &= Q(titre__icontains=term) | Q(description__icontains=term) | Q(competences_requises__icontains=term)
+        return queryset.filter(condition)
+
+    quote = connection.ops.quote_name
+    table = quote(queryset.model._meta.db_table)
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    # Les postes trouvés viennent de l'index (plus de LIKE sur chaque ligne) ; le rang bm25 est lu
+    # dans l'index par rowid, MATCH compris : bm25() n'a de sens que dans une requête MATCH
+    matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [query])
+    rank = RawSQL(
+        f'SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE}.rowid = {table}.{quote("id")} AND {FTS_TABLE} MATCH %s',
+        [query],
+        output_field=FloatField(),
+    )
+    return queryset.filter(pk__in=matches).annotate(search_rank=rank).order_by('search_rank')
+
+
+def rebuild_index() -> None:
+    """Reconstruit l'index depuis la table des postes (après un import SQL direct par exemple)."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+class PosteSearchFilter(filters.SearchFilter):
+    """``?search=`` sur l'index FTS5, résultats classés par pertinence.
+
+    Un paramètre ``ordering`` explicite (``OrderingFilter`` placé après) reste prioritaire.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return search_postes(queryset, request.query_params.get(self.search_param, ''))
@@ -3,7 +3,13 @@ from typing import Any
 
 from rest_framework import serializers
 
-from .models import Poste, Candidature, Score
+from accounts.models import UserProfile
+from accounts.permissions import request_roles
+
+from .chunked_uploads import DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, next_chunk
+from .models import Poste, Candidature, Score, Notification, UploadSession
+from .signed_urls import signed_document_url
+from .validators import ALLOWED_EXTENSIONS, EXTENSION_ERROR, MAX_FILE_SIZE_BYTES, SIZE_ERROR, file_extension
 
 
 class PosteSerializer(serializers.ModelSerializer):
@@ -33,13 +39,22 @@ class CandidatureSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'date_soumission', 'candidat', 'score']
 
+    def to_representation(self, instance: Candidature) -> dict[str, Any]:
+        data = super().to_representation(instance)
+        # Liens signés et temporaires à la place des URLs /media/ publiques
+        request = self.context.get('request')
+        user_id = request.user.pk if request and request.user.is_authenticated else None
+        for field in ('cv_file', 'lettre_motivation_file'):
+            url = signed_document_url(getattr(instance, field), user_id)
+            data[field] = request.build_absolute_uri(url) if url else None
+        return data
+
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         request = self.context.get('request')
         if request and request.user and request.user.is_authenticated:
-            user = request.user
             if self.instance is None and request.method in ("POST",):
-                role = getattr(getattr(user, 'profile', None), 'role', None)
-                if not (user.is_staff or user.is_superuser) and role != 'candidate':
+                roles = request_roles(request)
+                if not (roles.is_staff or roles.is_superuser) and roles.role != UserProfile.Roles.CANDIDATE:
                     raise serializers.ValidationError("Seuls les candidats peuvent soumettre une candidature.")
         return attrs
 
@@ -53,10 +68,57 @@ class CandidatureSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and request.user and request.user.is_authenticated:
             user = request.user
-            role = getattr(getattr(user, 'profile', None), 'role', None)
-            if user == instance.candidat and role == 'candidate':
+            if user.pk == instance.candidat_id and request_roles(request).role == UserProfile.Roles.CANDIDATE:
                 allowed = {'cv_file', 'lettre_motivation_file'}
                 for key in list(validated_data.keys()):
                     if key not in allowed:
                         validated_data.pop(key)
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return super().update(instance, validated_data)
+
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+    statut = serializers.ChoiceField(choices=Candidature.Statuts.choices)
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    # ``personal`` (Notification) ou ``broadcast`` (BroadcastNotification), posé par la pagination
+    source = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'source', 'notification_type', 'message', 'is_read', 'created_at']
+        read_only_fields = fields
+
+
+class MarkReadSerializer(serializers.Serializer):
+    # Sans ``ids`` ni ``broadcast_ids`` : tout ce qui est non lu
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=1000)
+    broadcast_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=1000)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    taille = serializers.IntegerField(min_value=1, max_value=MAX_FILE_SIZE_BYTES, error_messages={'max_value': SIZE_ERROR})
+    taille_morceau = serializers.IntegerField(min_value=MIN_CHUNK_SIZE, max_value=MAX_CHUNK_SIZE, default=DEFAULT_CHUNK_SIZE)
+    prochain_morceau = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'candidature', 'champ', 'nom_fichier', 'taille', 'taille_morceau',
+            'octets_recus', 'prochain_morceau', 'date_creation', 'date_fin',
+        ]
+        read_only_fields = ['id', 'octets_recus', 'date_creation', 'date_fin']
+
+    def get_prochain_morceau(self, session: UploadSession) -> int:
+        return next_chunk(session)
+
+    def validate_candidature(self, candidature: Candidature) -> Candidature:
+        request = self.context.get('request')
+        if not request or candidature.candidat_id != request.user.pk:
+            raise serializers.ValidationError("Candidature introuvable.")
+        return candidature
+
+    def validate_nom_fichier(self, nom: str) -> str:
+        if file_extension(nom) not in ALLOWED_EXTENSIONS:
+            raise serializers.ValidationError(EXTENSION_ERROR)
+        return nom
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.dispatch import Signal
+
+from accounts.digests import add_to_digest
+from accounts.models import UserProfile
+from accounts.outbox import queue_templated_emails
+from .events import broadcast_event, hub, notification_event
+from .models import BroadcastNotification, Candidature, Notification, Poste
+from .notifications import AUDIENCES, record_new_notifications
+
+# (id, email, fréquence de résumé) d'un destinataire
+Recipient = Tuple[int, str, Optional[str]]
+
+
+def recipients_queryset(roles: Sequence[str], include_staff: bool = False) -> QuerySet:
+    """Utilisateurs actifs ayant l'un des rôles donnés (ou membres du personnel avec ``include_staff``)."""
+    condition = Q(profile__role__in=list(roles))
+    if include_staff:
+        condition |= Q(is_staff=True)
+    return User.objects.filter(condition, is_active=True)
+
+
+def resolve_recipients(roles: Sequence[str], include_staff: bool = False) -> List[Recipient]:
+    """Résout en une seule requête les destinataires (dédoublonnés) ayant l'un des rôles donnés."""
+    rows = (
+        recipients_queryset(roles, include_staff)
+        .values_list('id', 'email', 'profile__digest_frequency')
+        .order_by('id')
+        .distinct()
+    )
+    return list(rows)
+
+
+def deliver(
+        entries: Iterable[Tuple[Recipient, str, Optional[Mapping]]],
+        notification_type: str,
+        email: Optional[Mapping] = None,
+) -> List[Notification]:
+    """Crée les notifications (un seul INSERT) et met en file les emails associés (un seul INSERT).
+
+    ``entries`` : (destinataire, message, contexte de l'email), un message propre à chaque destinataire.
+    ``email`` contient ``subject``, ``template_txt`` et ``html_template``.
+    """
+    entries = list(entries)
+    if not entries:
+        return []
+
+    notifications = Notification.objects.bulk_create([
+        Notification(user_id=recipient[0], notification_type=notification_type, message=message)
+        for recipient, message, _ in entries
+    ])
+    record_new_notifications(notification.user_id for notification in notifications)
+    hub.publish_on_commit((notification.user_id, notification_event(notification)) for notification in notifications)
+    if email:
+        queue_emails(entries, email)
+    return notifications
+
+
+def queue_emails(entries: Sequence[Tuple[Recipient, str, Optional[Mapping]]], email: Mapping) -> None:
+    """Met en file les emails (un seul INSERT) ; les utilisateurs en mode résumé reçoivent l'événement dans leur prochain digest."""
+    immediate_modes = (None, UserProfile.DigestFrequency.IMMEDIATE)
+    queue_templated_emails(
+        subject=email['subject'],
+        recipients=[(recipient[1], context) for recipient, _, context in entries if recipient[2] in immediate_modes],
+        template_txt=email['template_txt'],
+        html_template=email.get('html_template'),
+    )
+    add_to_digest(
+        (recipient[0], email['subject'], message)
+        for recipient, message, _ in entries
+        if recipient[2] not in immediate_modes
+    )
+
+
+def broadcast(
+        audience: str,
+        notification_type: str,
+        message: str,
+        email: Optional[Mapping] = None,
+) -> BroadcastNotification:
+    """Notifie une audience par une seule ligne ``BroadcastNotification`` (au lieu d'une par destinataire).
+
+    Les destinataires sont tout de même résolus (une requête) pour les emails, les compteurs de non
+    lues et le flux SSE.
+    """
+    recipients = resolve_recipients(*AUDIENCES[audience])
+    notification = BroadcastNotification.objects.create(
+        audience=audience, notification_type=notification_type, message=message,
+    )
+    record_new_notifications(recipient[0] for recipient in recipients)
+    hub.publish_on_commit((recipient[0], broadcast_event(notification)) for recipient in recipients)
+    if email:
+        context = email.get('context') or {}
+        queue_emails([(recipient, message, context) for recipient in recipients], email)
+    return notification
+
+
+def fan_out(
+        recipients: Iterable[Recipient],
+        notification_type: str,
+        message: str,
+        email: Optional[Mapping] = None,
+) -> List[Notification]:
+    """Même notification pour tous les destinataires (``email`` peut porter un ``context`` commun)."""
+    recipients = {recipient[0]: recipient for recipient in recipients}.values()
+    context = (email or {}).get('context') or {}
+    return deliver(((recipient, message, context) for recipient in recipients), notification_type, email)
+
+
+def notify_roles(
+        roles: Sequence[str],
+        notification_type: str,
+        message: str,
+        email: Optional[Mapping] = None,
+        include_staff: bool = False,
+) -> List[Notification]:
+    return fan_out(resolve_recipients(roles, include_staff=include_staff), notification_type, message, email)
+
+
+def notify_user(user: User, notification_type: str, message: str, email: Optional[Mapping] = None) -> List[Notification]:
+    profile = getattr(user, 'profile', None)
+    frequency = getattr(profile, 'digest_frequency', None)
+    return fan_out([(user.pk, user.email, frequency)], notification_type, message, email)
+
+
+# --- Changements de statut ---
+
+class StatusChange(NamedTuple):
+    candidature_id: int
+    poste_id: int
+    candidat_id: int
+    ancien: str
+    nouveau: str
+
+
+# Émis une fois par lot de changements de statut (``changes`` : liste de StatusChange),
+# qu'ils viennent d'un ``save()`` ou de ``transition_candidatures``.
+statuts_modifies = Signal()
+
+
+def emit_status_changes(changes: Sequence[StatusChange]) -> None:
+    if changes:
+        statuts_modifies.send(sender=Candidature, changes=list(changes))
+
+
+def transition_candidatures(queryset: QuerySet, statut: str) -> List[StatusChange]:
+    """Passe les candidatures du queryset à ``statut`` en un seul UPDATE et émet les changements en un lot."""
+    with transaction.atomic():
+        rows = list(
+            queryset.exclude(statut=statut)
+            .select_for_update()
+            .order_by()
+            .values_list('id', 'poste_id', 'candidat_id', 'statut')
+        )
+        if not rows:
+            return []
+        Candidature.objects.filter(pk__in=[row[0] for row in rows]).update(statut=statut)
+        changes = [StatusChange(pk, poste_id, candidat_id, ancien, statut) for pk, poste_id, candidat_id, ancien in rows]
+        emit_status_changes(changes)
+    return changes
+
+
+def notify_status_changes(changes: Sequence[StatusChange]) -> List[Notification]:
+    """Notifie les candidats concernés : deux lectures et une insertion pour tout le lot."""
+    titres = dict(Poste.objects.filter(pk__in={c.poste_id for c in changes}).values_list('id', 'titre'))
+    recipients = {
+        row[0]: row
+        for row in User.objects.filter(pk__in={c.candidat_id for c in changes}, is_active=True)
+        .values_list('id', 'email', 'profile__digest_frequency')
+    }
+    labels = dict(Candidature.Statuts.choices)
+    entries = []
+    for change in changes:
+        if change.candidat_id not in recipients:
+            continue
+        context = {"poste_titre": titres.get(change.poste_id, ''), "nouveau_statut": labels.get(change.nouveau, change.nouveau)}
+        message = f"Le statut de votre candidature pour le poste \"{context['poste_titre']}\" est maintenant : {context['nouveau_statut']}."
+        entries.append((recipients[change.candidat_id], message, context))
+    return deliver(entries, Notification.NotificationType.STATUT_CANDIDATURE, email={
+        "subject": "Mise à jour de votre candidature",
+        "template_txt": "recruitment/emails/status_update.txt",
+        "html_template": "recruitment/emails/status_update.html",
+    })
@@ -1,91 +1,127 @@
-from django.db.models import Q
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.contrib.auth.models import User
 from django.urls import reverse
 
-from accounts.models import UserProfile
-from accounts.utils import send_templated_email
-from .models import Candidature, Poste, Notification
+from .events import Event, hub
+from .models import BroadcastNotification, Candidature, Poste, Notification
+from .services import (
+    StatusChange, broadcast, emit_status_changes, notify_status_changes, statuts_modifies,
+)
+from .notifications import invalidate as invalidate_unread_count
+from .skills import sync_poste_competences
+from . import stats
 
 
 @receiver(post_save, sender=Candidature)
 def notify_on_candidature_change(sender, instance, created, **kwargs):
     """Notifie les recruteurs d'une nouvelle candidature ou le candidat d'un changement de statut."""
     if created:
-        # 1. Notifier les recruteurs d'une nouvelle candidature
-        recruteurs = User.objects.filter(profile__role=UserProfile.Roles.RECRUITER)
-        if not recruteurs.exists():
-            return
-
+        # 1. Notifier les recruteurs et admins d'une nouvelle candidature
         poste_url = reverse("recruitment:poste-detail", kwargs={"pk": instance.poste.pk})
         context = {
             "candidat_name": instance.candidat.get_full_name() or instance.candidat.username,
             "poste_titre": instance.poste.titre,
             "poste_url": poste_url,
         }
-
-        for recruteur in recruteurs:
-            Notification.objects.create(
-                user=recruteur,
-                notification_type=Notification.NotificationType.NOUVELLE_CANDIDATURE,
-                message=f"Nouvelle candidature de {context['candidat_name']} pour le poste: {context['poste_titre']}."
-            )
-            send_templated_email(
-                subject="Nouvelle candidature reçue",
-                to_emails=recruteur.email,
-                template_txt="recruitment/emails/new_candidature.txt",
-                html_template="recruitment/emails/new_candidature.html",
-                context=context,
-            )
+        broadcast(
+            BroadcastNotification.Audience.RECRUTEMENT,
+            Notification.NotificationType.NOUVELLE_CANDIDATURE,
+            f"Nouvelle candidature de {context['candidat_name']} pour le poste: {context['poste_titre']}.",
+            email={
+                "subject": "Nouvelle candidature reçue",
+                "template_txt": "recruitment/emails/new_candidature.txt",
+                "html_template": "recruitment/emails/new_candidature.html",
+                "context": context,
+            },
+        )
     else:
-        # 2. Notifier le candidat d'un changement de statut
-        try:
-            original_instance = Candidature.objects.get(pk=instance.pk)
-            if original_instance.statut != instance.statut:
-                context = {
-                    "poste_titre": instance.poste.titre,
-                    "nouveau_statut": instance.get_statut_display(),
-                }
-                Notification.objects.create(
-                    user=instance.candidat,
-                    notification_type=Notification.NotificationType.STATUT_CANDIDATURE,
-                    message=f"Le statut de votre candidature pour le poste \"{context['poste_titre']}\" est maintenant : {context['nouveau_statut']}."
-                )
-                send_templated_email(
-                    subject="Mise à jour de votre candidature",
-                    to_emails=instance.candidat.email,
-                    template_txt="recruitment/emails/status_update.txt",
-                    html_template="recruitment/emails/status_update.html",
-                    context=context,
-                )
-        except Candidature.DoesNotExist:
-            pass  # Ne rien faire si l'instance originale n'existe pas
+        # 2. Changement de statut : détecté en mémoire (valeur chargée vs valeur enregistrée), sans requête
+        update_fields = kwargs.get('update_fields')
+        change = instance.statut_change
+        if change and (update_fields is None or 'statut' in update_fields):
+            emit_status_changes([
+                StatusChange(instance.pk, instance.poste_id, instance.candidat_id, change[0], change[1]),
+            ])
+
+
+@receiver(statuts_modifies)
+def on_status_changes(sender, changes, **kwargs):
+    """Un seul traitement pour un save() comme pour une transition en masse."""
+    stats.record_status_changes((c.poste_id, c.ancien, c.nouveau) for c in changes)
+    notify_status_changes(changes)
+    hub.publish_on_commit(
+        (c.candidat_id, Event(None, 'candidature', {
+            'id': c.candidature_id, 'poste': c.poste_id, 'ancien': c.ancien, 'nouveau': c.nouveau,
+        }))
+        for c in changes
+    )
 
 
 @receiver(post_save, sender=Poste)
 def notify_admin_on_new_poste(sender, instance, created, **kwargs):
     """Notifie les administrateurs de la création d'un nouveau poste."""
     if created:
-        admins = User.objects.filter(Q(profile__role=UserProfile.Roles.ADMIN) | Q(is_staff=True))
-        if not admins.exists():
-            return
+        broadcast(
+            BroadcastNotification.Audience.ADMINISTRATION,
+            Notification.NotificationType.NOUVEAU_POSTE,
+            f"Un nouveau poste a été créé : {instance.titre}",
+            email={
+                "subject": "Nouveau poste créé",
+                "template_txt": "recruitment/emails/new_poste.txt",
+                "html_template": "recruitment/emails/new_poste.html",
+                "context": {
+                    "poste_titre": instance.titre,
+                    "poste_description": instance.description,
+                },
+            },
+        )
+
+
+@receiver(post_save, sender=Poste)
+def index_poste_competences(sender, instance, update_fields=None, **kwargs):
+    """Maintient l'index des compétences quand ``competences_requises`` peut avoir changé."""
+    if update_fields is None or 'competences_requises' in update_fields:
+        sync_poste_competences(instance)
+
+
+@receiver(post_save, sender=Candidature)
+def update_stats_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        stats.record_created(instance)
+        return
+    change = instance.poste_change
+    if change and (update_fields is None or {'poste', 'poste_id'} & set(update_fields)):
+        # Le changement de statut éventuel est compté à part, sur le nouveau poste
+        statut = instance.statut_change[0] if instance.statut_change else instance.statut
+        stats.record_poste_change(instance, change[0], statut)
+
+
+@receiver(post_delete, sender=Candidature)
+def update_stats_on_delete(sender, instance, **kwargs):
+    stats.record_deleted(instance)
+
+
+@receiver(post_delete, sender=Candidature)
+def release_documents_on_delete(sender, instance, **kwargs):
+    """Libère les documents (références du stockage dédupliqué) une fois la suppression validée."""
+    for fieldfile in (instance.cv_file, instance.lettre_motivation_file):
+        if fieldfile:
+            transaction.on_commit(partial(fieldfile.storage.delete, fieldfile.name))
+
+
+@receiver(post_save, sender=Candidature)
+def release_replaced_documents(sender, instance, created, **kwargs):
+    """Un document remplacé (ex. PATCH du CV) libère son ancienne référence une fois l'enregistrement validé."""
+    if not created:
+        storage = Candidature._meta.get_field('cv_file').storage
+        for name in instance.replaced_documents:
+            transaction.on_commit(partial(storage.delete, name))
 
-        context = {
-            "poste_titre": instance.titre,
-            "poste_description": instance.description,
-        }
 
-        for admin in admins:
-            Notification.objects.create(
-                user=admin,
-                notification_type=Notification.NotificationType.NOUVEAU_POSTE,
-                message=f"Un nouveau poste a été créé : {instance.titre}"
-            )
-            send_templated_email(
-                subject="Nouveau poste créé",
-                to_emails=admin.email,
-                template_txt="recruitment/emails/new_poste.txt",
-                html_template="recruitment/emails/new_poste.html",
-                context=context,
-            )
+@receiver(post_delete, sender=Notification)
+def update_unread_count_on_delete(sender, instance, **kwargs):
+    if not instance.is_read:
+        invalidate_unread_count(instance.user_id)
@@ -0,0 +1,51 @@
+"""URLs de documents signées (HMAC), limitées dans le temps et liées à un utilisateur.
+
+Le jeton contient le nom du fichier dans le stockage et l'id de l'utilisateur autorisé ;
+sa vérification (signature, expiration, utilisateur authentifié) ne charge ni ``Candidature`` ni ``UserProfile``.
+L'autorisation a lieu à la génération du lien : ne signer que pour un utilisateur qui a le droit de voir le document.
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import HashedTokenAuthentication
+
+SALT = 'recruitment.documents'
+DEFAULT_MAX_AGE = 600
+
+
+def max_age() -> int:
+    return getattr(settings, 'DOCUMENT_URL_MAX_AGE', DEFAULT_MAX_AGE)
+
+
+def sign_document(name: str, user_id: int) -> str:
+    return signing.TimestampSigner(salt=SALT).sign_object({'n': name, 'u': user_id}, compress=True)
+
+
+def unsign_document(token: str) -> Tuple[str, int]:
+    """(nom du fichier, id utilisateur). Lève ``signing.BadSignature`` (ou ``SignatureExpired``)."""
+    payload = signing.TimestampSigner(salt=SALT).unsign_object(token, max_age=max_age())
+    return payload['n'], payload['u']
+
+
+def signed_document_url(fieldfile, user_id: Optional[int]) -> str:
+    """Lien signé vers ``fieldfile`` pour ``user_id`` ; chaîne vide sans fichier ou sans utilisateur."""
+    if not fieldfile or not user_id:
+        return ''
+    return reverse('recruitment:signed_document', args=[sign_document(fieldfile.name, user_id)])
+
+
+def request_user_id(request) -> Optional[int]:
+    """Id de l'utilisateur authentifié : session (empreinte du mot de passe vérifiée) ou jeton d'API."""
+    if request.user.is_authenticated:
+        return request.user.pk
+    try:
+        authenticated = HashedTokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return authenticated[0].pk if authenticated else None
@@ -0,0 +1,85 @@
+"""Index inversé des compétences : ``Competence`` ↔ ``Poste`` (table de liaison indexée).
+
+Les compétences sont normalisées comme pour le scoring (``scoring.parse_skills``) :
+« Django, PostgreSQL » et « django et postgresql » donnent les mêmes entrées.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from django.db.models import Count, QuerySet
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from .models import Competence, Poste
+from .scoring import parse_skills
+
+MAX_LENGTH = Competence._meta.get_field('nom').max_length
+MATCH_ALL = 'all'
+MATCH_ANY = 'any'
+
+
+def normalize_skills(raw: str) -> List[str]:
+    return list(dict.fromkeys(skill[:MAX_LENGTH] for skill in parse_skills(raw)))
+
+
+def get_or_create_competences(names: Iterable[str]) -> dict:
+    """{nom: id} des compétences, créées au besoin (deux requêtes quel que soit le nombre)."""
+    names = list(names)
+    if not names:
+        return {}
+    Competence.objects.bulk_create([Competence(nom=name) for name in names], ignore_conflicts=True)
+    return dict(Competence.objects.filter(nom__in=names).values_list('nom', 'id'))
+
+
+def sync_poste_competences(poste: Poste) -> None:
+    """Met à jour les liens du poste : seules les compétences ajoutées ou retirées sont écrites."""
+    through = Poste.competences.through
+    wanted = set(normalize_skills(poste.competences_requises))
+    current = dict(
+        through.objects.filter(poste_id=poste.pk).values_list('competence__nom', 'competence_id')
+    )
+
+    removed = [current[name] for name in current.keys() - wanted]
+    if removed:
+        through.objects.filter(poste_id=poste.pk, competence_id__in=removed).delete()
+    added = wanted - current.keys()
+    if added:
+        ids = get_or_create_competences(added)
+        through.objects.bulk_create(
+            [through(poste_id=poste.pk, competence_id=ids[name]) for name in added], ignore_conflicts=True,
+        )
+
+
+def filter_by_skills(queryset: QuerySet, skills: Iterable[str], match: str = MATCH_ALL) -> QuerySet:
+    """Postes ayant toutes (``all``) ou au moins une (``any``) des compétences.
+
+    La requête ne lit que la table de liaison (listes de postes par compétence), jamais le texte.
+    """
+    names = list(dict.fromkeys(name for skill in skills for name in normalize_skills(skill)))
+    if not names:
+        return queryset
+    postings = Poste.competences.through.objects.filter(competence__nom__in=names)
+    if match == MATCH_ALL:
+        postings = (
+            postings.values('poste_id')
+            .annotate(matched=Count('competence_id'))
+            .filter(matched=len(names))
+        )
+    return queryset.filter(pk__in=postings.values('poste_id'))
+
+
+class SkillsFilter(filters.BaseFilterBackend):
+    """``?skills=python,django&match=all|any`` (``all`` par défaut)."""
+
+    skills_param = 'skills'
+    match_param = 'match'
+
+    def filter_queryset(self, request, queryset, view):
+        raw = request.query_params.get(self.skills_param, '')
+        if not raw.strip():
+            return queryset
+        match = request.query_params.get(self.match_param, MATCH_ALL)
+        if match not in (MATCH_ALL, MATCH_ANY):
+            raise ValidationError({self.match_param: f"Valeur attendue : {MATCH_ALL} ou {MATCH_ANY}."})
+        return filter_by_skills(queryset, raw.split(','), match)
@@ -0,0 +1,139 @@
+"""Statistiques de candidatures pré-agrégées (tables de cumul).
+
+Les compteurs sont modifiés par ``UPDATE ... SET total = total + n`` (expressions ``F()``) dans la
+transaction de la candidature : pas de lecture-modification-écriture, donc pas de mise à jour perdue.
+Les lectures (admin, tableaux de bord, API) ne parcourent plus les candidatures.
+``python manage.py rebuild_stats`` recalcule tout depuis les candidatures.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import Candidature, PosteStatutStat, SoumissionJournaliere
+
+
+def _apply(model, deltas: Dict[Tuple, int], key_fields: Tuple[str, str], create: bool = True) -> None:
+    """Ajoute ``delta`` au compteur de chaque clé ; crée les lignes manquantes (à 0) au besoin.
+
+    Chaque ``UPDATE``/``INSERT OR IGNORE`` est atomique en soi : en régime établi, une seule requête
+    par compteur, exécutée dans la transaction de l'appelant. ``create=False`` : les lignes absentes
+    sont laissées telles quelles.
+    """
+    missing = []
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        lookup = dict(zip(key_fields, key))
+        if not model.objects.filter(**lookup).update(total=F('total') + delta) and create:
+            missing.append((lookup, delta))
+    if missing:
+        model.objects.bulk_create([model(**lookup) for lookup, _ in missing], ignore_conflicts=True)
+        for lookup, delta in missing:
+            model.objects.filter(**lookup).update(total=F('total') + delta)
+
+
+def _day(moment) -> date:
+    return timezone.localdate(moment) if timezone.is_aware(moment) else moment.date()
+
+
+def record_created(candidature: Candidature) -> None:
+    _apply(PosteStatutStat, {(candidature.poste_id, candidature.statut): 1}, ('poste_id', 'statut'))
+    _apply(
+        SoumissionJournaliere, {(candidature.poste_id, _day(candidature.date_soumission)): 1}, ('poste_id', 'jour'),
+    )
+
+
+def record_deleted(candidature: Candidature) -> None:
+    # Compteur absent : supprimé avec le poste (cascade), rien à décompter ni à recréer
+    _apply(PosteStatutStat, {(candidature.poste_id, candidature.statut): -1}, ('poste_id', 'statut'), create=False)
+    _apply(
+        SoumissionJournaliere, {(candidature.poste_id, _day(candidature.date_soumission)): -1}, ('poste_id', 'jour'),
+        create=False,
+    )
+
+
+def record_poste_change(candidature: Candidature, ancien_poste_id: int, statut: str) -> None:
+    """Déplace les compteurs d'une candidature rattachée à un autre poste (``statut`` : avant la sauvegarde)."""
+    _apply(
+        PosteStatutStat,
+        {(ancien_poste_id, statut): -1, (candidature.poste_id, statut): 1},
+        ('poste_id', 'statut'),
+    )
+    jour = _day(candidature.date_soumission)
+    _apply(SoumissionJournaliere, {(ancien_poste_id, jour): -1, (candidature.poste_id, jour): 1}, ('poste_id', 'jour'))
+
+
+def record_status_changes(changes: Iterable[Tuple[int, str, str]]) -> None:
+    """``changes`` : (poste_id, ancien statut, nouveau statut), une entrée par candidature modifiée."""
+    deltas: Counter = Counter()
+    for poste_id, old, new in changes:
+        if old != new:
+            deltas[(poste_id, old)] -= 1
+            deltas[(poste_id, new)] += 1
+    _apply(PosteStatutStat, deltas, ('poste_id', 'statut'))
+
+
+def rebuild_stats() -> Tuple[int, int]:
+    """Recalcule les tables de cumul depuis les candidatures. Retourne (lignes statut, lignes jour)."""
+    with transaction.atomic():
+        PosteStatutStat.objects.all().delete()
+        SoumissionJournaliere.objects.all().delete()
+        statuts = PosteStatutStat.objects.bulk_create(
+            PosteStatutStat(poste_id=row['poste_id'], statut=row['statut'], total=row['total'])
+            for row in Candidature.objects.order_by().values('poste_id', 'statut').annotate(total=Count('id'))
+        )
+        jours = SoumissionJournaliere.objects.bulk_create(
+            SoumissionJournaliere(poste_id=row['poste_id'], jour=row['jour'], total=row['total'])
+            for row in Candidature.objects.order_by()
+            .annotate(jour=TruncDate('date_soumission'))
+            .values('poste_id', 'jour')
+            .annotate(total=Count('id'))
+        )
+    return len(statuts), len(jours)
+
+
+# --- Lectures ---
+
+def status_counts(poste_id: Optional[int] = None) -> Dict[str, int]:
+    """{statut: nombre} pour un poste ou pour tous les postes."""
+    rows = PosteStatutStat.objects.all()
+    if poste_id is not None:
+        rows = rows.filter(poste_id=poste_id)
+    return dict(rows.order_by().values_list('statut').annotate(n=Sum('total')))
+
+
+def counts_by_poste() -> Dict[int, Dict[str, int]]:
+    """{poste_id: {statut: nombre}}."""
+    counts: Dict[int, Dict[str, int]] = {}
+    for poste_id, statut, total in PosteStatutStat.objects.filter(total__gt=0).values_list('poste_id', 'statut', 'total'):
+        counts.setdefault(poste_id, {})[statut] = total
+    return counts
+
+
+def daily_submissions(since: date, poste_id: Optional[int] = None) -> Dict[date, int]:
+    """{jour: nombre de candidatures soumises} depuis ``since`` (inclus)."""
+    rows = SoumissionJournaliere.objects.filter(jour__gte=since)
+    if poste_id is not None:
+        rows = rows.filter(poste_id=poste_id)
+    return dict(rows.order_by('jour').values_list('jour').annotate(n=Sum('total')))
+
+
+def with_candidature_counts(postes: QuerySet) -> QuerySet:
+    """Annote ``candidatures_count`` sur des postes, lu dans la table de cumul (et non compté)."""
+    total = (
+        PosteStatutStat.objects.filter(poste=OuterRef('pk'))
+        .order_by()
+        .values('poste')
+        .annotate(somme=Sum('total'))
+        .values('somme')
+    )
+    return postes.annotate(
+        candidatures_count=Coalesce(Subquery(total, output_field=IntegerField()), Value(0)),
+    )
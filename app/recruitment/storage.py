@@ -0,0 +1,193 @@
+"""Stockage des documents adressé par contenu (SHA-256), avec déduplication et compteur de références.
+
+Chaque contenu est écrit une seule fois sous ``blobs/ab/cd/<sha256>``. Le nom logique produit par
+``upload_to_cv`` / ``upload_to_lettre`` reste le nom enregistré dans le modèle : c'est un lien
+symbolique relatif vers le blob, si bien que ``path()``, ``open()``, ``size()`` et les envois par le
+proxy (X-Accel-Redirect) fonctionnent sans requête SQL. ``StoredBlob.references`` compte les noms
+logiques ; le blob est supprimé quand le dernier disparaît.
+
+Le compteur est modifié dans la transaction de l'appelant, sous verrou de la ligne ``StoredBlob`` :
+un enregistrement annulé n'ajoute pas de référence, et une suppression concurrente ne peut pas
+retirer le blob entre la vérification et l'incrément. Le déplacement du blob et la création du lien
+ont lieu après validation (``on_commit``) ; d'ici là, ``path()`` résout le nom vers le contenu reçu.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from functools import partial
+
+from django.core.files import locks
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import connection, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = 'blobs'
+CHUNK_SIZE = 64 * 1024
+
+
+def blob_name(sha256: str) -> str:
+    return os.path.join(BLOB_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def document_storage():
+    """Stockage des CV et lettres (alias ``documents`` de ``STORAGES``)."""
+    return storages['documents']
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    def _pending(self) -> dict:
+        """Noms enregistrés dans la transaction en cours et pas encore liés : nom -> entrée."""
+        pending = getattr(self._local, 'pending', None)
+        if pending is None or not connection.in_atomic_block:
+            # Hors transaction, tout est validé (liens créés) ou annulé : rien n'est plus en attente
+            pending = self._local.pending = {}
+        return pending
+
+    def path(self, name: str) -> str:
+        entry = self._pending().get(str(name))
+        if entry is not None:
+            blob_path = super().path(blob_name(entry['sha256']))
+            received = entry['received']
+            return received if received and not os.path.exists(blob_path) else blob_path
+        return super().path(name)
+
+    def _save(self, name: str, content) -> str:
+        from .models import StoredBlob
+
+        # Empreinte déjà calculée pendant la réception (gestionnaire d'upload) : rien à relire
+        sha256 = getattr(content, 'sha256', None)
+        received = None
+        if not sha256:
+            sha256, received = self._receive(content)
+
+        with transaction.atomic():
+            StoredBlob.objects.bulk_create(
+                [StoredBlob(sha256=sha256, taille=content.size or 0, references=0)], ignore_conflicts=True,
+            )
+            # Verrou jusqu'à la fin de la transaction de l'appelant : ``delete`` attend
+            blob = StoredBlob.objects.select_for_update().get(pk=sha256)
+            if received is None:
+                # Même contenu déjà en attente dans cette transaction
+                received = next(
+                    (entry['received'] for entry in self._pending().values() if entry['sha256'] == sha256), None,
+                )
+            if received is None and blob.references <= 0:
+                # Contenu pas (ou plus) stocké : il faut le recevoir
+                if hasattr(content, 'temporary_file_path'):
+                    received = content.temporary_file_path()
+                else:
+                    received = self._receive(content)[1]
+            StoredBlob.objects.filter(pk=sha256).update(references=F('references') + 1)
+
+        name = str(name).replace('\\', '/')
+        entry = {'sha256': sha256, 'received': received, 'deleted': False}
+        self._pending()[name] = entry
+        transaction.on_commit(partial(self._link, name, entry))
+        return name
+
+    def _link(self, name: str, entry: dict) -> None:
+        """Après validation : met le blob en place s'il manque, puis crée le lien du nom logique."""
+        self._pending().pop(name, None)
+        blob_path = super().path(blob_name(entry['sha256']))
+        received = entry['received']
+        if received and os.path.exists(received):
+            if os.path.exists(blob_path):
+                # Doublon : le contenu est déjà stocké, la copie reçue est abandonnée
+                self._discard(received)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                file_move_safe(received, blob_path, allow_overwrite=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(blob_path, self.file_permissions_mode)
+        if entry['deleted']:
+            return
+        link_path = super().path(name)
+        target = os.path.relpath(blob_path, os.path.dirname(link_path))
+        os.makedirs(os.path.dirname(link_path), exist_ok=True, mode=self.directory_permissions_mode or 0o777)
+        try:
+            os.symlink(target, link_path)
+        except FileExistsError:
+            # Même nom validé en parallèle par une autre transaction
+            if not (os.path.islink(link_path) and os.readlink(link_path) == target):
+                logger.error("Nom de document déjà utilisé : %s", name)
+
+    def _receive(self, content):
+        """Calcule le SHA-256 du contenu en une passe. Retourne (empreinte, fichier à déplacer).
+
+        Un fichier déjà sur disque (``TemporaryUploadedFile``) est seulement lu : s'il est nouveau il
+        sera déplacé, pas recopié. Sinon les blocs sont hachés et écrits dans un fichier temporaire
+        au fil de la lecture.
+        """
+        digest = hashlib.sha256()
+        if hasattr(content, 'temporary_file_path'):
+            with open(content.temporary_file_path(), 'rb') as source:
+                while chunk := source.read(CHUNK_SIZE):
+                    digest.update(chunk)
+            return digest.hexdigest(), content.temporary_file_path()
+
+        tmp_dir = super().path(os.path.join(BLOB_DIR, 'tmp'))
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        with os.fdopen(fd, 'wb') as target:
+            locks.lock(target, locks.LOCK_EX)
+            for chunk in content.chunks(CHUNK_SIZE):
+                digest.update(chunk)
+                target.write(chunk)
+        return digest.hexdigest(), tmp_path
+
+    def _discard(self, path: str) -> None:
+        # Le fichier temporaire de Django est supprimé par Django lui-même
+        if os.path.dirname(path) == super().path(os.path.join(BLOB_DIR, 'tmp')):
+            os.remove(path)
+
+    def delete(self, name: str) -> None:
+        """Retire le nom logique ; le blob est supprimé après validation s'il n'est plus référencé."""
+        from .models import StoredBlob
+
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        entry = self._pending().pop(name, None)
+        if entry is not None:
+            # Enregistré dans cette transaction : le lien ne sera pas créé
+            entry['deleted'] = True
+            sha256 = entry['sha256']
+        else:
+            link_path = super().path(name)
+            if not os.path.islink(link_path):
+                # Fichier enregistré avant la déduplication
+                return super().delete(name)
+            sha256 = os.path.basename(os.readlink(link_path))
+            os.remove(link_path)
+        with transaction.atomic():
+            StoredBlob.objects.filter(pk=sha256).update(references=F('references') - 1)
+            orphan = StoredBlob.objects.filter(pk=sha256, references__lte=0).delete()[0]
+        if orphan:
+            transaction.on_commit(partial(self._remove_blob, sha256))
+
+    def _remove_blob(self, sha256: str) -> None:
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            # Une nouvelle référence a pu recréer la ligne entre-temps : le blob est alors conservé
+            if not StoredBlob.objects.select_for_update().filter(pk=sha256).exists():
+                super().delete(blob_name(sha256))
+
+    def blob_sha256(self, name: str):
+        """Empreinte du contenu derrière un nom logique (None pour un fichier non dédupliqué)."""
+        entry = self._pending().get(name)
+        if entry is not None:
+            return entry['sha256']
+        link_path = super().path(name)
+        return os.path.basename(os.readlink(link_path)) if os.path.islink(link_path) else None
@@ -0,0 +1,13 @@
+from django import template
+
+from recruitment.signed_urls import signed_document_url
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def signed_url(context, fieldfile):
+    """``{% signed_url candidature.cv_file %}`` : lien signé, valable pour l'utilisateur de la requête."""
+    request = context.get('request')
+    user = getattr(request, 'user', None)
+    return signed_document_url(fieldfile, user.pk if user is not None else None)
@@ -0,0 +1,102 @@
+"""Réception des documents de candidature : validation au fil de l'eau, sans attendre la fin du corps.
+
+``DocumentUploadHandler`` remplace les gestionnaires par défaut sur les vues qui reçoivent une
+candidature. Il refuse l'extension dès l'en-tête de la partie, vérifie les « magic bytes » sur le
+premier bloc et interrompt la lecture dès que 5 Mo sont dépassés (``StopUpload`` sans lire le reste
+du corps). Les champs placés après le fichier ne sont donc pas lus : le jeton CSRF doit précéder
+les fichiers (``{% csrf_token %}`` en tête du formulaire) ou passer par l'en-tête ``X-CSRFToken``.
+Le motif est conservé dans ``request.upload_errors`` pour être affiché par la vue.
+Comme les gestionnaires par défaut, un corps d'au plus ``FILE_UPLOAD_MAX_MEMORY_SIZE`` reste en
+mémoire ; au-delà le fichier est reçu sur disque.
+Le SHA-256 est calculé pendant la réception et transmis au stockage dédupliqué (``file.sha256``).
+"""
+from __future__ import annotations
+
+import hashlib
+from io import BytesIO
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+from .validators import (
+    ALLOWED_EXTENSIONS, EXTENSION_ERROR, MAX_FILE_SIZE_BYTES, SIGNATURE_ERROR, SIGNATURE_LENGTH, SIZE_ERROR,
+    file_extension, has_valid_signature,
+)
+
+
+class DocumentUploadHandler(FileUploadHandler):
+    in_memory = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.in_memory = content_length <= settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        # Créé avant toute vérification : le parseur ferme ce fichier-ci en cas de refus
+        if self.in_memory:
+            self.file = BytesIO()
+        else:
+            self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.received = 0
+        self.head = b''
+        self.digest = hashlib.sha256()
+        if file_extension(file_name) not in ALLOWED_EXTENSIONS:
+            self.reject(field_name, EXTENSION_ERROR)
+        if content_length is not None and content_length > MAX_FILE_SIZE_BYTES:
+            self.reject(field_name, SIZE_ERROR)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > MAX_FILE_SIZE_BYTES:
+            self.reject(self.field_name, SIZE_ERROR)
+        if len(self.head) < SIGNATURE_LENGTH:
+            self.head += raw_data[:SIGNATURE_LENGTH - len(self.head)]
+            if len(self.head) == SIGNATURE_LENGTH:
+                self.check_signature()
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if len(self.head) < SIGNATURE_LENGTH and not has_valid_signature(self.file_name, self.head):
+            # Fichier plus court que la signature, vérifié à la fin : il n'est simplement pas retenu
+            upload_errors(self.request)[self.field_name] = SIGNATURE_ERROR
+            self.file.close()
+            return None
+        self.file.seek(0)
+        if self.in_memory:
+            uploaded = InMemoryUploadedFile(
+                self.file, self.field_name, self.file_name, self.content_type, file_size, self.charset,
+                self.content_type_extra,
+            )
+        else:
+            uploaded = self.file
+            uploaded.size = file_size
+        uploaded.sha256 = self.digest.hexdigest()
+        return uploaded
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
+
+    def check_signature(self) -> None:
+        if not has_valid_signature(self.file_name, self.head):
+            self.reject(self.field_name, SIGNATURE_ERROR)
+
+    def reject(self, field_name: str, message: str) -> None:
+        upload_errors(self.request)[field_name] = message
+        # Le reste du corps n'est pas lu ; le fichier en cours est fermé (et supprimé) par le parseur
+        raise StopUpload(connection_reset=True)
+
+
+def document_upload_handlers(request) -> List[FileUploadHandler]:
+    return [DocumentUploadHandler(request)]
+
+
+def upload_errors(request) -> Dict[str, str]:
+    """Erreurs relevées pendant la réception, par nom de champ."""
+    request = getattr(request, '_request', request)
+    if not hasattr(request, 'upload_errors'):
+        request.upload_errors = {}
+    return request.upload_errors
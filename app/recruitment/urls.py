@@ -9,6 +9,8 @@ router = DefaultRouter()
 router.register(r'postes', api_views.PosteViewSet, basename='poste')
 router.register(r'candidatures', api_views.CandidatureViewSet, basename='candidature')
 router.register(r'scores', api_views.ScoreViewSet, basename='score')
+router.register(r'uploads', api_views.UploadSessionViewSet, basename='upload')
+router.register(r'notifications', api_views.NotificationViewSet, basename='notification')
 
 # URLs pour les vues web traditionnelles
 urlpatterns = [
@@ -19,6 +21,7 @@ urlpatterns = [
     path('postes/<int:pk>/modifier/', views.PosteUpdateView.as_view(), name='poste_update'),
     path('postes/<int:pk>/supprimer/', views.PosteDeleteView.as_view(), name='poste_delete'),
     path('postes/<int:poste_id>/candidatures/', views.PosteCandidaturesListView.as_view(), name='poste_candidatures'),
+    path('postes/<int:poste_id>/candidatures/export.zip', views.PosteCandidaturesExportView.as_view(), name='poste_candidatures_export'),
 
     # Vues pour les candidatures
     path('mes-candidatures/', views.UserCandidaturesListView.as_view(), name='user_candidatures'),
@@ -34,7 +37,13 @@ urlpatterns = [
 
     # URL sécurisée pour le téléchargement de CV
     path('candidatures/cv/<int:candidature_id>/', views.DownloadCVView.as_view(), name='download_cv'),
+    # Liens signés et temporaires vers les documents (CV, lettres)
+    path('documents/<str:token>/', views.SignedDocumentView.as_view(), name='signed_document'),
+
+    # Flux temps réel (Server-Sent Events) des notifications
+    path('notifications/stream/', views.NotificationStreamView.as_view(), name='notification_stream'),
 
     # URLs de l'API
+    path('api/stats/', api_views.StatsView.as_view(), name='api_stats'),
     path('api/', include(router.urls)),
 ]
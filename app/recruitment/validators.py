@@ -8,16 +8,35 @@ from django.utils.deconstruct import deconstructible
 
 ALLOWED_EXTENSIONS: Set[str] = {".pdf", ".doc", ".docx"}
 MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB
+# Signatures (« magic bytes ») attendues en tête de fichier ; DOCX = archive ZIP
+FILE_SIGNATURES = {
+    ".pdf": (b"%PDF-",),
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+    ".docx": (b"PK\x03\x04",),
+}
+SIGNATURE_LENGTH = 8
+
+EXTENSION_ERROR = "Extension de fichier non autorisée. Utilisez PDF, DOC ou DOCX."
+SIZE_ERROR = "Fichier trop volumineux (max 5 Mo)."
+SIGNATURE_ERROR = "Type de fichier non autorisé : le contenu ne correspond pas à l'extension."
+
+
+def file_extension(name: str) -> str:
+    return os.path.splitext((name or "").lower())[1]
+
+
+def has_valid_signature(name: str, head: bytes) -> bool:
+    """Vérifie que les premiers octets correspondent à l'extension (PDF, OLE pour DOC, ZIP pour DOCX)."""
+    return head.startswith(FILE_SIGNATURES.get(file_extension(name), ()))
 
 
 @deconstructible
 class DocumentUploadValidator:
     def __call__(self, file_obj) -> None:
         name = getattr(file_obj, "name", "")
-        _, ext = os.path.splitext(name.lower())
 
-        if ext not in ALLOWED_EXTENSIONS:
-            raise ValidationError("Extension de fichier non autorisée. Utilisez PDF, DOC ou DOCX.")
+        if file_extension(name) not in ALLOWED_EXTENSIONS:
+            raise ValidationError(EXTENSION_ERROR)
 
         size = getattr(file_obj, "size", None)
         if size is None:
@@ -27,7 +46,14 @@ class DocumentUploadValidator:
             file_obj.seek(pos)
 
         if size and size > MAX_FILE_SIZE_BYTES:
-            raise ValidationError("Fichier trop volumineux (max 5 Mo).")
+            raise ValidationError(SIZE_ERROR)
+
+        pos = file_obj.tell()
+        file_obj.seek(0)
+        head = file_obj.read(SIGNATURE_LENGTH)
+        file_obj.seek(pos)
+        if not has_valid_signature(name, head):
+            raise ValidationError(SIGNATURE_ERROR)
 
 
 validate_document_file = DocumentUploadValidator()
\ No newline at end of file
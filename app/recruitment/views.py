@@ -1,15 +1,27 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.auth.models import User
-from django.db.models import Count
-from django.http import FileResponse, Http404, HttpResponseForbidden
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Count, F
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.generic import DetailView, FormView, ListView, TemplateView, View, CreateView, UpdateView, DeleteView
 from accounts.decorators import AdminRequiredMixin, RecruiterRequiredMixin, CandidateRequiredMixin
 
 from accounts.models import UserProfile
-from .forms import CandidatureForm, PosteForm, CandidatureStatusForm
-from .models import Candidature, Poste, Notification
+from accounts.permissions import request_roles
+from .forms import CandidatureForm, PosteForm, CandidatureStatusForm, DashboardFilterForm
+from .models import Candidature, Poste
+from .downloads import serve_file, serve_stored_file
+from .events import event_stream
+from .exports import export_filename, export_queryset, parse_statuts, zip_response
+from .search import search_postes
+from .signed_urls import request_user_id, unsign_document
+from .uploads import document_upload_handlers, upload_errors
+from . import stats
 
 
 class PosteListView(ListView):
@@ -20,7 +32,12 @@ class PosteListView(ListView):
         return ["recruitment/poste_list.html"]
 
     def get_queryset(self):
-        return Poste.objects.filter(actif=True)
+        return search_postes(Poste.objects.filter(actif=True), self.request.GET.get('q', ''))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['q'] = self.request.GET.get('q', '')
+        return context
 
 
 class UserCandidaturesListView(CandidateRequiredMixin, ListView):
@@ -32,7 +49,9 @@ class UserCandidaturesListView(CandidateRequiredMixin, ListView):
         return Candidature.objects.filter(candidat=self.request.user).select_related('poste')
 
 
+@method_decorator(csrf_exempt, name='dispatch')
 class PosteDetailView(DetailView):
+    # CSRF vérifié dans post() : le middleware lirait le corps avant l'installation du gestionnaire d'upload
     model = Poste
     template_name = "recruitment/poste_detail.html"
     context_object_name = "poste"
@@ -48,31 +67,31 @@ class PosteDetailView(DetailView):
         return context
 
     def post(self, request, *args, **kwargs):
+        # Documents validés pendant la réception (taille, signature) : voir recruitment.uploads
+        request.upload_handlers = document_upload_handlers(request)
+        return self.receive_candidature(request, *args, **kwargs)
+
+    @method_decorator(csrf_protect)
+    def receive_candidature(self, request, *args, **kwargs):
         self.object = self.get_object()
         
         if not request.user.is_authenticated:
             return redirect('accounts:login')
         
         form = CandidatureForm(request.POST, request.FILES)
-        if form.is_valid():
+        errors = upload_errors(request)
+        if form.is_valid() and not errors:
             candidature = form.save(commit=False)
             candidature.candidat = request.user
             candidature.poste = self.object
-            candidature.save()
-
-            # Create notifications for recruiters and admins
-            admins_and_recruiters = User.objects.filter(
-                profile__role__in=[UserProfile.Roles.ADMIN, UserProfile.Roles.RECRUITER]
-            ).distinct()
-            for user in admins_and_recruiters:
-                Notification.objects.create(
-                    user=user,
-                    notification_type=Notification.NotificationType.NOUVELLE_CANDIDATURE,
-                    message=f"Nouvelle candidature de {candidature.candidat.get_full_name()} pour le poste {candidature.poste.titre}."
-                )
+            with transaction.atomic():
+                # Les notifications recruteurs/admins sont créées par le signal post_save
+                candidature.save()
 
             return redirect(self.request.path)
-        
+
+        for field, message in errors.items():
+            form.add_error(field if field in form.fields else None, message)
         context = self.get_context_data()
         context['form'] = form
         return self.render_to_response(context)
@@ -135,16 +154,77 @@ class PosteCandidaturesListView(AdminRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['poste'] = self.poste
+        context['statuts'] = Candidature.Statuts.choices
         return context
 
 
+class PosteCandidaturesExportView(RecruiterRequiredMixin, View):
+    """Archive ZIP des CV et lettres d'un poste, filtrable par ``?statut=`` (répétable), envoyée en flux."""
+
+    def get(self, request, poste_id):
+        poste = get_object_or_404(Poste, pk=poste_id)
+        try:
+            statuts = parse_statuts(request.GET.getlist('statut'))
+        except ValueError as exc:
+            return HttpResponseBadRequest(f"Statut inconnu : {exc}")
+        return zip_response(export_queryset(poste.pk, statuts), export_filename(poste))
+
+
 class RecruiterDashboardView(RecruiterRequiredMixin, ListView):
+    """Filtres, tri et pagination côté serveur : le coût d'une page ne dépend pas du volume total."""
+
     model = Candidature
     template_name = "recruitment/dashboard_recruteur.html"
     context_object_name = "candidatures"
+    paginate_by = 25
+
+    def get(self, request, *args, **kwargs):
+        self.filter_form = DashboardFilterForm(request.GET or None)
+        filters = self.filter_form.filters()
+        # Les compteurs exacts (GROUP BY sur les mêmes filtres) servent aussi de total à la pagination
+        self.exact_counts = not set(filters) <= {'poste_id'}
+        if not self.exact_counts:
+            # Sans filtre de date, les compteurs viennent de la table de cumul
+            counts = stats.status_counts(filters.get('poste_id'))
+        else:
+            # Compteurs par statut : une requête agrégée (GROUP BY) sur les mêmes filtres
+            counts = dict(
+                Candidature.objects.filter(**filters).order_by().values_list('statut').annotate(total=Count('id'))
+            )
+        self.status_counts = [
+            {'value': value, 'label': label, 'count': counts.get(value, 0)}
+            for value, label in Candidature.Statuts.choices
+        ]
+        self.statut = self.filter_form.value('statut')
+        self.total_all = sum(counts.values())
+        self.total = counts.get(self.statut, 0) if self.statut else self.total_all
+        self.filters = filters
+        return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
-        return Candidature.objects.select_related("candidat", "poste", "score").all()
+        queryset = Candidature.objects.select_related("candidat", "poste", "score").filter(**self.filters)
+        if self.statut:
+            queryset = queryset.filter(statut=self.statut)
+        if self.filter_form.value('tri') == DashboardFilterForm.Tri.SCORE:
+            return queryset.order_by(F('score__score_ia').desc(nulls_last=True), '-date_soumission')
+        return queryset.order_by('-date_soumission', '-id')
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, orphans, allow_empty_first_page, **kwargs)
+        if self.exact_counts:
+            # Déjà connu par les compteurs : pas de COUNT(*) supplémentaire. La table de cumul, elle,
+            # n'est qu'un affichage : la pagination ne doit pas dépendre d'un éventuel écart.
+            paginator.count = self.total
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['filter_form'] = self.filter_form
+        context['status_counts'] = self.status_counts
+        context['total'] = self.total
+        context['total_all'] = self.total_all
+        context['statut'] = self.statut
+        return context
 
 
 class AdminDashboardView(AdminRequiredMixin, ListView):
@@ -152,23 +232,62 @@ class AdminDashboardView(AdminRequiredMixin, ListView):
     template_name = "recruitment/dashboard_admin.html"
     context_object_name = "postes"
 
+    def get_queryset(self):
+        return stats.with_candidature_counts(Poste.objects.all())
+
 
 class DownloadCVView(LoginRequiredMixin, View):
     def get(self, request, candidature_id):
         candidature = get_object_or_404(Candidature, pk=candidature_id)
         user = request.user
 
-        is_admin = hasattr(user, "profile") and user.profile.role == UserProfile.Roles.ADMIN
-        is_recruiter = hasattr(user, "profile") and user.profile.role == UserProfile.Roles.RECRUITER
-        is_owner = candidature.candidat == user
+        is_owner = candidature.candidat_id == user.id
 
-        if not (is_admin or is_recruiter or is_owner):
+        if not (is_owner or request_roles(request).role in (UserProfile.Roles.ADMIN, UserProfile.Roles.RECRUITER)):
             return HttpResponseForbidden("Vous n'avez pas la permission de voir ce fichier.")
 
         if not candidature.cv_file:
             raise Http404("Fichier CV non trouvé.")
 
+        return serve_file(request, candidature.cv_file)
+
+
+class SignedDocumentView(View):
+    """Sert un document à partir d'un lien signé, à l'utilisateur (session ou jeton d'API) pour qui il a été signé."""
+
+    def get(self, request, token):
+        try:
+            name, user_id = unsign_document(token)
+        except signing.SignatureExpired:
+            return HttpResponseForbidden("Ce lien a expiré.")
+        except signing.BadSignature:
+            raise Http404("Lien invalide.")
+        if user_id != request_user_id(request):
+            return HttpResponseForbidden("Ce lien ne vous est pas destiné.")
+        return serve_stored_file(request, Candidature._meta.get_field('cv_file').storage, name)
+
+
+class NotificationStreamView(View):
+    """Flux SSE des notifications de l'utilisateur connecté ; à servir en ASGI (une coroutine par client)."""
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            # En WSGI, la réponse asynchrone serait entièrement mise en tampon : le client n'en recevrait rien
+            return HttpResponse(
+                "Le flux de notifications nécessite un serveur ASGI (uvicorn app.asgi:application).",
+                status=501, content_type='text/plain; charset=utf-8',
+            )
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponseForbidden("Authentification requise.")
+        # ``EventSource`` renvoie ``Last-Event-ID`` à la reconnexion ; paramètre pour la première connexion
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
         try:
-            return FileResponse(candidature.cv_file.open("rb"), as_attachment=True)
-        except FileNotFoundError:
-            raise Http404("Fichier non trouvé sur le disque.")
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_event_id = None
+        response = StreamingHttpResponse(event_stream(user.pk, last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Pas de mise en tampon par Nginx
+        response['X-Accel-Buffering'] = 'no'
+        return response